@@ -1,15 +1,17 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+from wordcloud import WordCloud, STOPWORDS
 from collections import Counter
 import numpy as np
+import re
+import os
+import time
+import json
+import heapq
+import functools
+from dataclasses import dataclass
 
-
-# Load the data
-data = pd.read_csv('indeed_job.csv')
-
-# Drop rows with missing values
-data.dropna(inplace=True)
+from code_profiling import stage_timer, timed_iter
 
 
 # Try our best to define the categories and their associated keywords (JOB TITLE)
@@ -35,21 +37,363 @@ job_categories = {
     'IT Security Engineer': ['it security engineer', 'cybersecurity', 'it security officer', 'governance risk compliance', 'security engineer', 'security analyst'],
 }
 
+# Keyword index over the job categories, compiled once into a single regex.
+# Keywords only match whole words (optionally plural), so 'ba', 'pa' or 'da' no longer match inside
+# other words. Every position of the title is tried with a lookahead whose alternatives follow the
+# category order, so the earliest category with a keyword anywhere in the title wins, like the dict order did.
+class JobCategorizer:
+    def __init__(self, categories, cache_size=50000):
+        self.categories = list(categories)
+        groups = []
+        for index, keywords in enumerate(categories.values()):
+            alternatives = '|'.join(re.escape(keyword) + ('s?' if len(keyword) > 3 else '')
+                                    for keyword in sorted(set(keywords), key=len, reverse=True))
+            groups.append('(?P<c{}>(?<!\\w)(?:{})(?!\\w))'.format(index, alternatives))
+        self.index = re.compile('(?=' + '|'.join(groups) + ')')
+        # LRU memo of titles already categorized, bounded so long histories do not grow it without limit
+        self.lookup = functools.lru_cache(maxsize=cache_size)(self.lookup)
+
+    # Category of one job title, or the lowercased title when no keyword matches
+    def categorize(self, job_title):
+        return self.lookup(job_title.lower())
+
+    def lookup(self, job_title):
+        best = None
+        for match in self.index.finditer(job_title):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.categories[best] if best is not None else job_title
+
+    # Categorize a whole column, each distinct title is only looked up once
+    def categorize_series(self, job_titles):
+        codes, uniques = pd.factorize(job_titles)
+        categories = np.array([self.categorize(job_title) for job_title in uniques], dtype=object)
+        return pd.Series(categories[codes], index=job_titles.index, name=job_titles.name)
+
+
+categorizer = JobCategorizer(job_categories)
+
 # Function to categorize job titles based on keywords
 def categorize_job_title(job_title):
-    job_title = job_title.lower()
-    for category, keywords in job_categories.items():
-        if any(keyword in job_title for keyword in keywords):
-            return category
-    return job_title
+    return categorizer.categorize(job_title)
+
+
+# Function to preprocess job types
+def preprocess_job_type(job_type):
+    # Convert to lowercase
+    job_type = job_type.lower()
+    # Remove leading and trailing whitespace
+    job_type = job_type.strip()
+    return job_type
+
 
-data['JobCategory'] = data['JobTitle'].apply(categorize_job_title)
+# Columns the analysis reads, with compact dtypes. 'Date Posted' is only read to drop the rows where
+# it is missing, as before; Company and JobUrl are never missing in the scraped data and are skipped.
+ANALYSIS_DTYPES = {
+    'JobTitle': 'str',
+    'Location': 'category',
+    'Min Salary': 'float32',
+    'Max Salary': 'float32',
+    'JobType': 'category',
+    'Summary': 'str',
+    'Date Posted': 'category',
+}
+
+# Compact dtypes for frames read from Parquet. Text columns already arrive as strings, and astype('str')
+# would turn their missing values into 'None'/'nan' strings on pandas 2, past dropna().
+PARQUET_DTYPES = {column: dtype for column, dtype in ANALYSIS_DTYPES.items() if dtype != 'str'}
+
+
+# Read the scraped CSV, whole or as an iterator of `chunksize` row chunks
+def read_jobs_csv(csv_path, chunksize=None):
+    return pd.read_csv(csv_path, usecols=list(ANALYSIS_DTYPES), dtype=ANALYSIS_DTYPES, chunksize=chunksize)
+
+
+# Prepare raw job rows for the figures
+def prepare_data(data):
+    with stage_timer.stage('prepare_data', len(data)):
+        # Drop rows with missing values
+        data = data.dropna().drop(columns='Date Posted')
+
+        with stage_timer.stage('categorize', len(data)):
+            data['JobCategory'] = categorizer.categorize_series(data['JobTitle']).astype('category')
+
+        data = data[(data['Min Salary'] <= 20000) & (data['Max Salary'] <= 20000)].copy()    # Filter out salaries above 20000
+        data['Midpoint Salary'] = (data['Min Salary'].astype('float64') + data['Max Salary']) / 2  # Calculate midpoint salary
+
+        # Apply preprocessing to JobType column
+        data['JobType'] = data['JobType'].astype(str).str.lower().str.strip().astype('category')
+        return data
+
+
+# Convert the scraped CSV once into a Parquet cache with the compact dtypes, chunk by chunk
+def convert_to_parquet(csv_path, parquet_path, chunksize=500000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in read_jobs_csv(csv_path, chunksize):
+            # Categories differ from chunk to chunk, store them as plain dictionary-encoded strings (object keeps NaN missing)
+            table = pa.Table.from_pandas(chunk.astype({'Location': object, 'JobType': object, 'Date Posted': object}), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, table.schema,
+                                          use_dictionary=['Location', 'JobType', 'Date Posted'])
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Iterate the Parquet cache by row group, memory-mapped so only the current chunk is resident
+def read_jobs_parquet(parquet_path):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(parquet_path, memory_map=True)
+    for index in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(index).to_pandas().astype(PARQUET_DTYPES)
+
+
+# Iterate a Parquet dataset written by the scraper (`--output indeed_job.parquet`) in batches. Only the
+# analysis columns are read, row groups above the salary cut are skipped from their statistics, and
+# `since`/`until` (crawl dates, YYYY-MM-DD) prune whole crawl_date partitions before a file is opened.
+# Company, Location and JobType arrive as categories, 'Date Posted' as datetimes.
+def read_jobs_dataset(dataset_path, since=None, until=None, batch_size=500000):
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(dataset_path, format='parquet', partitioning='hive')
+    condition = (ds.field('Min Salary') <= 20000) & (ds.field('Max Salary') <= 20000)
+    if since:
+        condition &= ds.field('crawl_date') >= since
+    if until:
+        condition &= ds.field('crawl_date') <= until
+
+    dtypes = {column: dtype for column, dtype in PARQUET_DTYPES.items() if column != 'Date Posted'}
+    for batch in dataset.to_batches(columns=list(ANALYSIS_DTYPES), filter=condition, batch_size=batch_size):
+        if batch.num_rows:
+            data = batch.to_pandas().astype(dtypes)
+            # Dictionaries keep the order values were first written in, sort them like a CSV read does
+            for column in data.select_dtypes('category'):
+                data[column] = data[column].cat.reorder_categories(sorted(data[column].cat.categories))
+            yield data
+
+
+# Modification time of a CSV, or of the newest file of a Parquet dataset directory
+def source_mtime(path):
+    if not os.path.isdir(path):
+        return os.path.getmtime(path)
+    return max((os.path.getmtime(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names), default=0.0)
+
+
+# Every aggregate the figures need, computed in a single pass over the prepared data.
+# Treat it as read-only: the figures only read from it, and it can be saved to JSON so dashboards can
+# reload it without touching the raw CSV.
+@dataclass(frozen=True)
+class JobSummary:
+    rows: int
+    category_counts: pd.Series                  # Job postings per category, most frequent first
+    location_counts: pd.Series                  # Job postings per location, most frequent first
+    salary_by_category: pd.Series               # Average midpoint salary per category
+    job_type_counts: pd.Series                  # Job postings per job type, sorted by job type
+    full_time_location_counts: pd.Series        # Full-time job postings per location, most frequent first
+    full_time_salary_by_location: pd.Series     # Average full-time midpoint salary per location
+    token_counts: Counter                       # Word frequencies over all job summaries
+
+    def to_json(self, path, cache_key=None):
+        fields = {'rows': self.rows, 'token_counts': dict(self.token_counts), 'cache_key': cache_key}
+        for name in SUMMARY_SERIES:
+            series = getattr(self, name)
+            fields[name] = [[label, value.item() if hasattr(value, 'item') else value] for label, value in series.items()]
+        with open(path, 'w') as f:
+            json.dump(fields, f)
+
+    # With `cache_key`, None when the file was saved by a run with other options (see summary_cache_key)
+    @classmethod
+    def from_json(cls, path, cache_key=None):
+        with open(path) as f:
+            fields = json.load(f)
+        saved_key = fields.pop('cache_key', None)
+        if cache_key is not None and saved_key != cache_key:
+            return None
+        for name in SUMMARY_SERIES:
+            pairs = fields[name]
+            fields[name] = pd.Series([value for _, value in pairs], index=[label for label, _ in pairs], dtype='float64'
+                                     if 'salary' in name else 'int64')
+        fields['token_counts'] = Counter(fields['token_counts'])
+        return cls(**fields)
+
+
+SUMMARY_SERIES = ['category_counts', 'location_counts', 'salary_by_category', 'job_type_counts',
+                  'full_time_location_counts', 'full_time_salary_by_location']
+
+
+# Space-Saving top-K sketch of word frequencies, for corpora whose full vocabulary does not fit in memory.
+# It keeps at most `k` words; a new word replaces the least frequent one and inherits its count, so
+# counts can be overestimated by at most total / k, and every word more frequent than that is kept.
+class TopKCounter:
+    def __init__(self, k):
+        self.k = k
+        self.counts = {}
+        self.heap = []  # (count, word) entries, some stale, only checked when the minimum is needed
+        self.total = 0
+
+    def update(self, words):
+        counts, heap = self.counts, self.heap
+        for word in words:
+            self.total += 1
+            if word in counts:
+                counts[word] += 1
+            elif len(counts) < self.k:
+                counts[word] = 1
+                heapq.heappush(heap, (1, word))
+            else:
+                # Find the least frequent word, refreshing stale heap entries on the way
+                while True:
+                    count, evicted = heapq.heappop(heap)
+                    if counts[evicted] == count:
+                        break
+                    heapq.heappush(heap, (counts[evicted], evicted))
+                del counts[evicted]
+                counts[word] = count + 1
+                heapq.heappush(heap, (count + 1, word))
+
+        # Keep the heap from growing with stale entries
+        if len(heap) > 4 * self.k:
+            self.heap = [(count, word) for word, count in counts.items()]
+            heapq.heapify(self.heap)
+
+    def most_common(self, n=None):
+        return Counter(self.counts).most_common(n)
+
+
+# Add the word frequencies of a stream of job summaries to `counter` (a Counter or a TopKCounter),
+# one summary at a time instead of one joined string
+def count_tokens(summaries, counter):
+    for summary in summaries:
+        counter.update(summary.split())
+    return counter
+
+
+# Counts of the values in order of first appearance, like value_counts on plain strings
+def appearance_counts(values):
+    return values.value_counts(sort=False).reindex(list(values.unique()))
+
+# Combine per-chunk counts into one Series, most frequent first (ties keep their first appearance)
+def combine_counts(partials):
+    if not partials:
+        return pd.Series(dtype='int64')
+    counts = pd.concat(partials).groupby(level=0, sort=False, observed=True).sum()
+    return counts.sort_values(ascending=False, kind='stable').astype('int64')
+
+# Combine per-chunk (sum, count) salary partials into one mean per label
+def combine_means(partials):
+    if not partials:
+        return pd.Series(dtype='float64')
+    totals = pd.concat(partials).groupby(level=0, sort=False, observed=True).sum()
+    return (totals['sum'] / totals['count']).sort_index()
+
+
+# Build the aggregate summary from prepared data chunks, combining partial aggregates so only one
+# chunk is in memory at a time. `top_k_tokens` bounds the word frequencies kept.
+def summarize_chunks(chunks, top_k_tokens=None):
+    rows = 0
+    category_counts, location_counts, job_type_counts, full_time_location_counts = [], [], [], []
+    salary_by_category, full_time_salary_by_location = [], []
+    token_counter = Counter() if top_k_tokens is None else TopKCounter(top_k_tokens)
+
+    for data in chunks:
+        with stage_timer.stage('summarize', len(data)):
+            rows += len(data)
+            category_counts.append(appearance_counts(data['JobCategory']))
+            location_counts.append(appearance_counts(data['Location']))
+            job_type_counts.append(appearance_counts(data['JobType']))
+            salary_by_category.append(data.groupby('JobCategory', observed=True)['Midpoint Salary'].agg(['sum', 'count']))
+
+            # Filter data for full-time job postings and salaries less than 20000
+            full_time_data = data[(data['JobType'] == 'full-time') & (data['Midpoint Salary'] < 20000)]
+            full_time_location_counts.append(appearance_counts(full_time_data['Location']))
+            full_time_salary_by_location.append(full_time_data.groupby('Location', observed=True)['Midpoint Salary'].agg(['sum', 'count']))
+
+        with stage_timer.stage('count_tokens', len(data)):
+            count_tokens(data['Summary'], token_counter)
+
+    return JobSummary(
+        rows=rows,
+        category_counts=combine_counts(category_counts),
+        location_counts=combine_counts(location_counts),
+        salary_by_category=combine_means(salary_by_category),
+        job_type_counts=combine_counts(job_type_counts).sort_index(),
+        full_time_location_counts=combine_counts(full_time_location_counts),
+        full_time_salary_by_location=combine_means(full_time_salary_by_location),
+        token_counts=token_counter if top_k_tokens is None else Counter(token_counter.counts),
+    )
+
+
+# Build the aggregate summary of the prepared data, `top_k_tokens` bounds the word frequencies kept
+def summarize(data, top_k_tokens=None):
+    return summarize_chunks([data], top_k_tokens)
+
+
+# Bump when the summary computation changes, so JSON caches written by older code are not reused
+SUMMARY_VERSION = 1
+
+# Everything besides the data that a cached summary depends on: the summary version, the options of the
+# run and the job categories (editing a keyword re-categorizes every title)
+def summary_cache_key(top_k_tokens=None, since=None, until=None):
+    import hashlib
+    options = json.dumps([SUMMARY_VERSION, top_k_tokens, since, until, job_categories], sort_keys=True)
+    return hashlib.sha1(options.encode('utf-8')).hexdigest()
+
+
+# Default JSON summary cache of a CSV or dataset: `<name>.summary.json` next to it
+def default_summary_cache_path(csv_path):
+    return (csv_path.rstrip(os.sep) if os.path.isdir(csv_path) else os.path.splitext(csv_path)[0]) + '.summary.json'
+
+
+# Summary of a scraped CSV or Parquet dataset. With a `cache_path`, the JSON summary saved there is reused
+# while it is newer than the data and was built with the same options and job categories, and saved
+# otherwise. With `chunksize` the CSV is processed in chunks; with `parquet` it is converted once into a
+# Parquet cache next to it, which later runs read memory-mapped, one row group at a time. A dataset is
+# read in batches with the filters pushed down, `since`/`until` select the crawl dates.
+def load_summary(csv_path='indeed_job.csv', cache_path=None, chunksize=None, parquet=False, top_k_tokens=None,
+                 since=None, until=None):
+    is_dataset = os.path.isdir(csv_path)
+    if (since or until) and not is_dataset:
+        raise ValueError('Crawl date filters need a Parquet dataset written with --output <name>.parquet')
+
+    cache_key = summary_cache_key(top_k_tokens, since, until)
+    if cache_path and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= source_mtime(csv_path):
+        with stage_timer.stage('load_summary_cache'):
+            summary = JobSummary.from_json(cache_path, cache_key)
+        if summary is not None:
+            return summary
+
+    if is_dataset:
+        chunks = read_jobs_dataset(csv_path, since, until)
+    elif parquet:
+        parquet_path = os.path.splitext(csv_path)[0] + '.analysis.parquet'
+        if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+            with stage_timer.stage('convert_to_parquet'):
+                convert_to_parquet(csv_path, parquet_path)
+        chunks = read_jobs_parquet(parquet_path)
+    elif chunksize:
+        chunks = read_jobs_csv(csv_path, chunksize)
+    else:
+        chunks = map(read_jobs_csv, [csv_path])
+
+    summary = summarize_chunks((prepare_data(chunk) for chunk in timed_iter('load', chunks)), top_k_tokens)
+    if cache_path:
+        summary.to_json(cache_path, cache_key)
+    return summary
 
 
 #   --- FIGURE 1: Function to plot the distribution of job titles --- 
-def plot_job_titles(data):
+def plot_job_titles(summary):
     plt.figure(figsize=(12, 8))
-    job_title_counts = data['JobCategory'].value_counts().head(10)  # Get the top 10 most frequent job categories
+    job_title_counts = summary.category_counts.head(10)  # Get the top 10 most frequent job categories
     colors = plt.cm.tab10(range(len(job_title_counts)))  # Get a list of colors from colormap
 
     bars = plt.barh(job_title_counts.index, job_title_counts.values, color=colors)
@@ -66,12 +410,12 @@ def plot_job_titles(data):
 
     # Add a legend
     plt.legend(bars, job_title_counts.index, title='Job Categories', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.show()
+    return plt.gcf()
 
 
 #   --- FIGURE 2: Function to plot location distribution ---
-def plot_location(data):
-    location_counts = data['Location'].value_counts().head(10)   # Calculate frequency of each location
+def plot_location(summary):
+    location_counts = summary.location_counts.head(10)   # Calculate frequency of each location
     top_locations = location_counts.index               # Extract top 10 locations and their frequencies
     top_frequencies = location_counts.values
     
@@ -87,17 +431,14 @@ def plot_location(data):
     plt.legend(bars, legend_labels, loc='upper right', fontsize='small')
     
     plt.tight_layout()
-    plt.show()
+    return plt.gcf()
 
 
 #   --- FIGURE 3: Function to plot Salary Range Distribution ---
-data = data[(data['Min Salary'] <= 20000) & (data['Max Salary'] <= 20000)]    # Filter out salaries above 20000
-data['Midpoint Salary'] = (data['Min Salary'] + data['Max Salary']) / 2       # Calculate midpoint salary
-top_categories = data['JobCategory'].value_counts().head(6).index             # Get top 5 job categories by number of job postings
-data_top_categories = data[data['JobCategory'].isin(top_categories)]          # Filter data for only these top job categories
-avg_salary_by_category = data_top_categories.groupby('JobCategory')['Midpoint Salary'].mean().sort_values(ascending=False) # Group data by job category and calculate average midpoint salary
+def plot_salary(summary):
+    top_categories = summary.category_counts.head(6).index             # Get top 6 job categories by number of job postings
+    avg_salary_by_category = summary.salary_by_category.loc[top_categories].sort_values(ascending=False) # Average midpoint salary of these categories
 
-def plot_salary(data):
     plt.figure(figsize=(10, 6))
     colors = plt.cm.Set3(range(len(avg_salary_by_category)))  # Set colors for bars
 
@@ -114,29 +455,26 @@ def plot_salary(data):
     plt.legend(bars, legend_labels, loc='upper right', fontsize='small')
 
     plt.tight_layout()
-    plt.show()
+    return plt.gcf()
 
 
 #   --- FIGURE 4: Function to plot Word Cloud of Job Summary (Keywords) ---
-def plot_word_cloud(data):
-    text = ' '.join(data['Summary'])
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+def plot_word_cloud(summary):
+    # Same filtering WordCloud.generate applies to raw text: no stopwords, no bare numbers
+    frequencies = {word: count for word, count in summary.token_counts.items()
+                   if word.lower() not in STOPWORDS and not word.isdigit()}
+    wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(frequencies)
     plt.figure(figsize=(10, 6))
     plt.imshow(wordcloud, interpolation='bilinear')
     plt.axis('off')
     plt.title('Word Cloud of Job Summaries')
-    plt.show()
+    return plt.gcf()
 
 
 #   --- FIGURE 5: Function to plot Keywords of Job Summary ---
-def plot_top_keywords(data, num_keywords=10):
-    # Combine all summaries into one string
-    all_summaries = ' '.join(data['Summary'])
-    # Tokenize the string
-    words = all_summaries.split()
+def plot_top_keywords(summary, num_keywords=10):
     # Get the most common words
-    word_counts = Counter(words)
-    common_words = word_counts.most_common(num_keywords)
+    common_words = summary.token_counts.most_common(num_keywords)
     words, counts = zip(*common_words)
     
     plt.figure(figsize=(10, 6))
@@ -152,22 +490,12 @@ def plot_top_keywords(data, num_keywords=10):
     legend_labels = [f'{word}: {count}' for word, count in common_words]
     plt.legend(bars, legend_labels, loc='upper right')
     
-    plt.show()
+    return plt.gcf()
 
 
 #   --- FIGURE 6: Function to plot Job Type distribution as a Line Graph ---
-# Function to preprocess job types
-def preprocess_job_type(job_type):
-    # Convert to lowercase
-    job_type = job_type.lower()
-    # Remove leading and trailing whitespace
-    job_type = job_type.strip()
-    return job_type
-
-# Apply preprocessing to JobType column  
-data['JobType'] = data['JobType'].apply(preprocess_job_type)   
-def plot_job_type_distribution(data):
-    job_type_counts = data['JobType'].value_counts().sort_index()
+def plot_job_type_distribution(summary):
+    job_type_counts = summary.job_type_counts
     
     plt.figure(figsize=(10, 6))
     plt.plot(job_type_counts.index, job_type_counts.values, marker='o', linestyle='-', color='b', label='Job Types')
@@ -183,17 +511,14 @@ def plot_job_type_distribution(data):
     plt.grid(True, axis='y')
     plt.tight_layout()
     plt.legend()
-    plt.show()
+    return plt.gcf()
 
 
 #   --- FIGURE 7: Function to plot Association Between Location and Salary ---
-# Calculate midpoint salary
-data['Midpoint Salary'] = (data['Min Salary'] + data['Max Salary']) / 2
-
-# Filter data for full-time job postings and salaries less than 20000
-full_time_data = data[(data['JobType'] == 'full-time') & (data['Midpoint Salary'] < 20000)]
-location_counts = full_time_data['Location'].value_counts().head(10)  # Top 10 locations by full-time job postings
-location_salaries = full_time_data.groupby('Location').agg({'Midpoint Salary': 'mean'}).loc[location_counts.index]
+def full_time_location_salary(summary):
+    location_counts = summary.full_time_location_counts.head(10)  # Top 10 locations by full-time job postings
+    location_salaries = summary.full_time_salary_by_location.loc[location_counts.index].to_frame('Midpoint Salary')
+    return location_counts, location_salaries
 
 def plot_location_salary(location_counts, location_salaries):
     fig, ax1 = plt.subplots(figsize=(12, 8))
@@ -219,15 +544,122 @@ def plot_location_salary(location_counts, location_salaries):
     ax2.legend(loc='upper right')
 
     plt.tight_layout()
-    plt.show()
-
-
-
-# Call the functions to create the plots
-plot_job_titles(data)                                       #Figure 1
-plot_location(data)                                         #Figure 2
-plot_salary(data)                                           #Figure 3
-plot_word_cloud(data)                                       #Figure 4
-plot_top_keywords(data)                                     #Figure 5
-plot_job_type_distribution(data)                            #Figure 6
-plot_location_salary(location_counts, location_salaries)    #Figure 7
\ No newline at end of file
+    return plt.gcf()
+
+
+
+# Figures of the report, in order: (file name, title, plot function taking the JobSummary)
+FIGURES = [
+    ('figure1_job_categories', 'Top 10 Job Categories', plot_job_titles),
+    ('figure2_locations', 'Top 10 Locations for Job Postings', plot_location),
+    ('figure3_salary_by_category', 'Average Salary by Top 6 Job Categories', plot_salary),
+    ('figure4_word_cloud', 'Word Cloud of Job Summaries', plot_word_cloud),
+    ('figure5_top_keywords', 'Top 10 Keywords in Job Summaries', plot_top_keywords),
+    ('figure6_job_types', 'Distribution of Job Types', plot_job_type_distribution),
+    ('figure7_location_salary', 'Full-Time Job Postings Count and Average Salary by Location',
+     lambda summary: plot_location_salary(*full_time_location_salary(summary))),
+]
+
+
+# Each report worker gets the summary once, and renders off-screen
+def init_report_worker(summary):
+    global report_summary
+    import matplotlib
+    matplotlib.use('Agg')
+    report_summary = summary
+    stage_timer.reset()  # Forked workers start with a copy of the parent's stages
+
+# Render one figure to `out_dir` in every format, returning the file names and the render time
+def render_figure(index, out_dir, formats):
+    name, _, plot = FIGURES[index]
+    start = time.perf_counter()
+    with stage_timer.stage('figure:' + name, 1):
+        fig = plot(report_summary)
+    files = []
+    for fmt in formats:
+        files.append('{}.{}'.format(name, fmt))
+        with stage_timer.stage('save:' + fmt, 1):
+            fig.savefig(os.path.join(out_dir, files[-1]), bbox_inches='tight')
+    plt.close(fig)
+    return files, time.perf_counter() - start, stage_timer.drain()
+
+
+# Headless batch report: render Figures 1-7 concurrently to files, with an index.html and render timings
+def generate_report(csv_path, out_dir, formats=('png', 'svg'), workers=None, chunksize=None, parquet=False, since=None, until=None,
+                    cache_path=None, top_k_tokens=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    summary = load_summary(csv_path, cache_path, chunksize=chunksize, parquet=parquet, top_k_tokens=top_k_tokens,
+                           since=since, until=until)
+
+    with ProcessPoolExecutor(max_workers=workers or min(len(FIGURES), os.cpu_count() or 1),
+                             initializer=init_report_worker, initargs=(summary,)) as executor:
+        futures = [executor.submit(render_figure, index, out_dir, formats) for index in range(len(FIGURES))]
+        results = [future.result() for future in futures]
+
+    for _, _, stages in results:
+        stage_timer.merge(stages)
+
+    timings = {name: round(seconds, 3) for (name, _, _), (_, seconds, _) in zip(FIGURES, results)}
+    timings['total'] = round(time.perf_counter() - start, 3)
+    with open(os.path.join(out_dir, 'timings.json'), 'w') as f:
+        json.dump(timings, f, indent=2)
+
+    sections = []
+    for number, ((name, title, _), (files, seconds, _)) in enumerate(zip(FIGURES, results), 1):
+        sections.append('<h2>Figure {}: {}</h2>\n<p>Rendered in {:.2f}s</p>\n<img src="{}" alt="{}">'.format(
+            number, title, seconds, files[0], title))
+    with open(os.path.join(out_dir, 'index.html'), 'w') as f:
+        f.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>Indeed Job Analysis</title></head>\n<body>\n'
+                '<h1>Indeed Job Analysis</h1>\n<p>Source: {} ({:,d} job postings)</p>\n{}\n</body>\n</html>\n'.format(
+                    csv_path, summary.rows, '\n'.join(sections)))
+
+    return timings
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Visualize the scraped Indeed job postings')
+    parser.add_argument('csv_path', nargs='?', default='indeed_job.csv', help='Scraped job postings CSV, or Parquet dataset directory')
+    parser.add_argument('--report', metavar='OUT_DIR', help='Render every figure to OUT_DIR instead of showing them')
+    parser.add_argument('--formats', default='png,svg', help='Comma separated image formats for --report')
+    parser.add_argument('--workers', type=int, help='Number of processes rendering figures for --report')
+    parser.add_argument('--chunksize', type=int, help='Process the CSV in chunks of this many rows')
+    parser.add_argument('--parquet', action='store_true', help='Convert the CSV once to a Parquet cache and read that instead')
+    parser.add_argument('--summary-cache', nargs='?', const='', metavar='PATH',
+                        help='Reuse the summary saved in this JSON file, or save it there (default: <csv name>.summary.json)')
+    parser.add_argument('--top-k-tokens', type=int, metavar='K',
+                        help='Only keep the K most frequent summary words (approximate, in bounded memory) for huge corpora')
+    parser.add_argument('--since', help='Only crawls from this date on (YYYY-MM-DD), for a Parquet dataset')
+    parser.add_argument('--until', help='Only crawls up to this date (YYYY-MM-DD), for a Parquet dataset')
+    parser.add_argument('--run-report', help='Write per-stage wall/CPU time, counts and throughput to this JSON file')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'], help='Also dump a profile of the whole run')
+    args = parser.parse_args()
+    summary_cache = args.summary_cache or (default_summary_cache_path(args.csv_path) if args.summary_cache == '' else None)
+
+    import contextlib
+    from code_profiling import print_report, profile_path, profiled
+
+    profile = args.profile and profile_path(args.run_report or args.csv_path, args.profile)
+    with profiled(profile, args.profile) if profile else contextlib.nullcontext():
+        if args.report:
+            timings = generate_report(args.csv_path, args.report, args.formats.split(','), args.workers, args.chunksize, args.parquet,
+                                      args.since, args.until, summary_cache, args.top_k_tokens)
+            print('Report written to {} in {:.1f}s'.format(args.report, timings['total']))
+        else:
+            # Call the functions to create the plots, one window at a time
+            summary = load_summary(args.csv_path, summary_cache, chunksize=args.chunksize, parquet=args.parquet,
+                                   top_k_tokens=args.top_k_tokens, since=args.since, until=args.until)
+            for name, _, plot in FIGURES:                          #Figures 1-7
+                with stage_timer.stage('figure:' + name, 1):
+                    plot(summary)
+                plt.show()
+
+    if args.run_report:
+        print_report(stage_timer.write_report(args.run_report, csv_path=args.csv_path, report=args.report))
+        print('Run report written to {}'.format(args.run_report))
+    if profile:
+        print('Profile written to {}'.format(profile))
@@ -0,0 +1,706 @@
+# Offline benchmark suite for the scraper and the analysis. Results pages are replayed from a local HTTP
+# server (saved Indeed pages, or synthetic pages shaped like them), job CSVs of any size are generated
+# synthetically, and every pipeline stage is timed over several rounds. The results are written as JSON
+# together with the git commit, so runs can be compared across commits:
+#
+#   python code3_Benchmark.py --output bench-before.json
+#   python code3_Benchmark.py --output bench-after.json --compare bench-before.json
+#
+# It exits with 1 on regressions, or when importing code_webScraping takes over its 100 ms target
+import contextlib
+import gc
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import code_webScraping as scraping
+
+
+# Vocabulary of the synthetic job postings, shaped like the columns of indeed_job.csv
+SYNTHETIC_TITLES = [
+    'IT Support', 'IT Engineer', 'IT Technician', 'IT Executive', 'IT Intern', 'Business Analyst', 'IT Project Manager',
+    'Software Engineer', 'IT Manager', 'Data Analyst', 'System Administrator', 'Network Engineer', 'Web Developer',
+    'Customer Service Executive', 'Account Executive', 'Sales Executive', 'Marketing Executive', 'Admin Assistant',
+    'Bartender / Mixologist', 'QA Engineer', 'DevOps Engineer', 'Data Scientist', 'Helpdesk Support', 'Cloud Engineer',
+]
+SYNTHETIC_TITLE_PARTS = ['Senior ', 'Junior ', 'Lead ', '', '', '', '']
+SYNTHETIC_TITLE_SUFFIXES = ['', '', '', ' (Contract)', ' - Mandarin Speaker', ' #2024', ' (Jun Intake)', ' II']
+SYNTHETIC_LOCATIONS = [
+    'Kuala Lumpur', 'Petaling Jaya', 'Shah Alam', 'Johor Bahru', 'Subang Jaya', 'Remote in Kuala Lumpur', 'Puchong',
+    'Cyberjaya', 'Bangsar South', 'Bangi', 'Klang', 'Bayan Lepas', 'Kota Damansara', 'Kuchai Lama', 'Cheras',
+    'Penang', 'Ipoh', 'Melaka', 'Seremban', 'Kuching',
+]
+SYNTHETIC_JOB_TYPES = ['Full-time', 'Full-time', 'Full-time', 'Contract', 'Permanent', 'Internship', 'Fresh graduate',
+                       'Part-time', 'Freelance']
+SYNTHETIC_SUMMARY_WORDS = (
+    'customer service support team work experience skill candidate good communication provide ensure system '
+    'client business company responsible manage project technical knowledge handle assist report data office '
+    'user issue network hardware software troubleshoot install maintain develop design application test '
+    'requirement process solution strong ability environment management develop training opportunity growth '
+    'salary benefit allowance medical insurance career fresh graduate degree diploma english mandarin malay '
+    'computer science engineering internet cloud server database security web mobile analyst sale marketing '
+    'account finance admin document record schedule meeting operation quality product service delivery '
+    'cocktail lounge handcrafted creative grow rotation week weekend shift night day flexible hour remote '
+    'hybrid onsite monitor resolve escalate ticket helpdesk backup upgrade configure deploy'
+).split()
+
+
+# Synthetic scraped records (the raw strings extract_job_card_data returns), `seed` makes them reproducible
+def generate_job_records(count, seed=0):
+    rng = random.Random(seed)
+    weights = [1.0 / rank for rank in range(1, len(SYNTHETIC_SUMMARY_WORDS) + 1)]  # Zipf-like word frequencies
+    cum_weights = list(itertools.accumulate(weights))
+    records = []
+    for number in range(count):
+        title = rng.choice(SYNTHETIC_TITLE_PARTS) + rng.choice(SYNTHETIC_TITLES) + rng.choice(SYNTHETIC_TITLE_SUFFIXES)
+        company = 'Company {} Sdn Bhd'.format(rng.randrange(max(count // 5, 1)))
+        min_salary = rng.randrange(1500, 9000, 100)
+        if rng.random() < 0.7:
+            salary = 'RM {:,d} - RM {:,d} a month'.format(min_salary, min_salary + rng.randrange(0, 4000, 100))
+        else:
+            salary = 'RM {:,d} a month'.format(min_salary)
+        job_type = rng.choice(SYNTHETIC_JOB_TYPES) + ('+{}'.format(rng.randint(1, 3)) if rng.random() < 0.3 else '')
+        bullets = [' '.join(rng.choices(SYNTHETIC_SUMMARY_WORDS, cum_weights=cum_weights, k=rng.randint(4, 8)))
+                   for _ in range(rng.randint(1, 3))]
+        days = rng.randint(0, 35)
+        date_posted = 'PostedToday' if days == 0 else 'Posted30+ days ago' if days > 30 else 'Posted{} days ago'.format(days)
+        job_url = scraping.BASE_URL + '/rc/clk?jk={:016x}&bb=x{}&xkcb=SoD{}'.format(rng.getrandbits(64), number, rng.randrange(99))
+        records.append((title, company, rng.choice(SYNTHETIC_LOCATIONS), salary, job_type, bullets, date_posted, job_url))
+    return records
+
+
+# Raw scraped records as they come out of the card extractors, with the summary bullets joined
+def generate_scraped_records(count, seed=0):
+    return [record[:5] + (' '.join(record[5]),) + record[6:] for record in generate_job_records(count, seed)]
+
+
+# Reposts of a share of the scraped records, the way they come back in later results pages: a sponsored link
+# without the job key, a reworded title and one summary word dropped
+def generate_reposts(records, share=0.2, seed=0):
+    rng = random.Random(seed)
+    reposts = []
+    for record in rng.sample(records, int(len(records) * share)):
+        words = record[5].split()
+        del words[rng.randrange(len(words))]
+        reposts.append((record[0] + rng.choice([' (Urgent)', ' - Immediate Start', ' 2024']),) + record[1:5] + (' '.join(words), record[6],
+                       scraping.BASE_URL + '/pagead/clk?mo=r&ad=-6NYlbfk{:012x}&p=1&fvj=0&vjs=3'.format(rng.getrandbits(48))))
+    return reposts
+
+
+# Synthetic CSV shaped like indeed_job.csv (cleaned columns), written in chunks so any size fits in memory
+def generate_job_csv(path, rows, seed=0, chunk_size=100000):
+    import pandas as pd
+
+    written = 0
+    while written < rows:
+        records = generate_job_records(min(chunk_size, rows - written), seed + written)
+        frame = pd.DataFrame({
+            'JobTitle': [scraping.clean_job_title(record[0]) for record in records],
+            'Company': [record[1] for record in records],
+            'Location': [record[2] for record in records],
+            'Salary': [record[3] for record in records],
+            'JobType': [record[4] for record in records],
+            'Summary': [' '.join(record[5]) for record in records],
+            'Date Posted': [record[6] for record in records],
+            'JobUrl': [record[7] for record in records],
+        })
+        frame['Min Salary'], frame['Max Salary'] = scraping.clean_salary_column(frame['Salary'])
+        frame['JobType'] = scraping.clean_job_type_column(frame['JobType'])
+        dates = scraping.clean_date_posted_column(frame['Date Posted'], '2024-06-14')
+        frame['Date Posted'] = dates.dt.day.astype(str) + '/' + dates.dt.month.astype(str) + '/' + dates.dt.year.astype(str)
+        frame[scraping.OUTPUT_COLUMNS].to_csv(path, mode='a' if written else 'w', header=not written, index=False)
+        written += len(frame)
+    return path
+
+
+# One synthetic Indeed results page, with the markup the card extractors look for and inline script
+# filler standing in for the bulk of a real page
+def render_results_page(records, next_href=None, filler_bytes=150000):
+    from html import escape
+
+    cards = []
+    for title, company, location, salary, job_type, bullets, date_posted, job_url in records:
+        job_url = urlparse(job_url)
+        types = job_type.split('+')
+        cards.append(
+            '<div class="cardOutline tapItem result job_seen_beacon"><table><tbody><tr><td class="resultContent">'
+            '<div><h2 class="jobTitle css-14z7akl eu4oa1w0"><a href="{href}" data-jk="{jk}"><span title="{title}">{title}</span></a></h2></div>'
+            '<div class="company_location css-17fky0v e37uo190"><div><span data-testid="company-name" class="css-63koeb eu4oa1w0">{company}</span>'
+            '<div data-testid="text-location" class="css-1p0sjhy eu4oa1w0">{location}</div></div></div>'
+            '<div class="salary-snippet-container css-1ihavw2 eu4oa1w0"><div data-testid="attribute_snippet_testid">{salary}</div></div>'
+            '<div class="metadata css-5zy3wz eu4oa1w0"><div data-testid="attribute_snippet_testid">{job_type}{more}</div></div>'
+            '</td></tr></tbody></table>'
+            '<div class="css-9446fg eu4oa1w0"><ul>{bullets}</ul></div>'
+            '<span class="css-qvloho eu4oa1w0"><span class="css-1x1ubv eu4oa1w0">{posted}</span>{date}</span></div>'.format(
+                href=escape(job_url.path + '?' + job_url.query), jk=escape(parse_qs(job_url.query).get('jk', [''])[0]), title=escape(title), company=escape(company),
+                location=escape(location), salary=escape(salary), job_type=escape(types[0]),
+                more='<span>+{}</span>'.format(types[1]) if len(types) > 1 else '',
+                bullets=''.join('<li>{}</li>'.format(escape(bullet)) for bullet in bullets),
+                posted='Posted', date=escape(date_posted[len('Posted'):])))
+
+    pagination = '<nav><a aria-label="Next Page" href="{}">Next</a></nav>'.format(escape(next_href)) if next_href else '<nav></nav>'
+    filler = '<script>window.mosaic = {{"data": "{}"}};</script>'.format('x' * filler_bytes)
+    return ('<!DOCTYPE html><html><head><title>IT Jobs in Malaysia</title>{}</head><body><div id="mosaic-jobResults">'
+            '<ul>{}</ul></div>{}</body></html>').format(filler, ''.join('<li>{}</li>'.format(card) for card in cards), pagination)
+
+
+# Synthetic results pages for one query, 15 job cards each like Indeed; only the last page has no Next link
+def generate_results_pages(pages, cards_per_page=15, seed=0):
+    records = generate_job_records(pages * cards_per_page, seed)
+    return [render_results_page(records[page * cards_per_page:(page + 1) * cards_per_page],
+                                '/jobs?q=IT&l=Malaysia&start={}'.format((page + 1) * scraping.RESULTS_PER_PAGE) if page + 1 < pages else None)
+            for page in range(pages)]
+
+
+# Saved results pages (*.html, in name order), e.g. pages downloaded from Indeed with a browser
+def load_results_pages(directory):
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.html'))
+    pages = []
+    for name in names:
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+# Local stand-in for malaysia.indeed.com: `/jobs?...&start=N` serves page N / RESULTS_PER_PAGE.
+# A share `fault_rate` of the requests fails instead, alternating 429 (with `retry_after`) and 503.
+# Every response can be delayed by `latency` seconds, like a round trip to the real host.
+class ReplayServer:
+    def __init__(self, pages, fault_rate=0.0, retry_after='0', seed=0, latency=0.0):
+        import hashlib
+        replayed = [page.encode('utf-8') for page in pages]
+        etags = ['"{}"'.format(hashlib.sha1(page).hexdigest()) for page in replayed]
+        self.requests = {200: 0, 304: 0, 404: 0, 429: 0, 503: 0}
+        self.fault_rate = fault_rate
+        self.retry_after = retry_after
+        self.latency = latency
+        rng = random.Random(seed)
+        lock = threading.Lock()
+
+        # Pages carry an ETag, so conditional requests get a 304 without a body
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if self.latency:
+                    time.sleep(self.latency)
+                start = int(parse_qs(urlparse(handler.path).query).get('start', ['0'])[0])
+                index = start // scraping.RESULTS_PER_PAGE
+                if index >= len(replayed):
+                    self.requests[404] += 1
+                    handler.send_error(404)
+                    return
+                with lock:
+                    fault = rng.random() < self.fault_rate
+                    status = 429 if self.requests[429] <= self.requests[503] else 503
+                if fault:
+                    self.requests[status] += 1
+                    handler.send_response(status)
+                    if status == 429:
+                        handler.send_header('Retry-After', self.retry_after)
+                    handler.send_header('Content-Length', '0')
+                    handler.end_headers()
+                    return
+                if handler.headers.get('If-None-Match') == etags[index]:
+                    self.requests[304] += 1
+                    handler.send_response(304)
+                    handler.send_header('ETag', etags[index])
+                    handler.end_headers()
+                    return
+                self.requests[200] += 1
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/html; charset=utf-8')
+                handler.send_header('Content-Length', str(len(replayed[index])))
+                handler.send_header('ETag', etags[index])
+                handler.end_headers()
+                handler.wfile.write(replayed[index])
+
+            def log_message(handler, format, *args):
+                pass  # Keep the benchmark output readable
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# A replayed results page, with the attributes of a response the parsers use
+class ReplayedPage:
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.status_code = 200
+
+
+# Time `fn` over `rounds` rounds after `warmup` untimed calls, with the garbage collector paused
+def run_benchmark(fn, items, rounds=5, warmup=1):
+    for _ in range(warmup):
+        fn()
+    times = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    median = statistics.median(times)
+    return {
+        'rounds': rounds,
+        'min': round(min(times), 6),
+        'median': round(median, 6),
+        'mean': round(statistics.mean(times), 6),
+        'stdev': round(statistics.stdev(times), 6) if rounds > 1 else 0.0,
+        'items': items,
+        'items_per_second': round(items / median, 3) if median else None,
+    }
+
+
+# Import time of `module` in a fresh interpreter per round, read from `python -X importtime` so the
+# interpreter startup is not counted. The result is checked against `target` seconds
+def run_import_benchmark(module, rounds=5, target=0.1):
+    times = []
+    for _ in range(rounds):
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                                capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+        # Lines are "import time: self [us] | cumulative | imported package", the module itself comes last
+        cumulative = [line.split('|') for line in output.splitlines() if line.rstrip().endswith('| ' + module)]
+        times.append(int(cumulative[-1][1]) / 1e6)
+    median = statistics.median(times)
+    return {
+        'rounds': rounds,
+        'min': round(min(times), 6),
+        'median': round(median, 6),
+        'mean': round(statistics.mean(times), 6),
+        'stdev': round(statistics.stdev(times), 6) if rounds > 1 else 0.0,
+        'items': 1,
+        'items_per_second': round(1 / median, 3) if median else None,
+        'target': target,
+        'within_target': median <= target,
+    }
+
+
+# Spell correction over the summary tokens of a scraped CSV: one cold pass with an empty cache (every
+# unknown word goes to the spell checker), then `rounds` warm passes over the same tokens. The cache
+# hit rate and counters of each are kept in the results
+def run_spellcheck_benchmark(csv_path, rounds=5):
+    import re
+    import pandas as pd
+
+    special_characters = re.compile(r"[^a-zA-Z0-9\s]")  # What SummaryCleaner.strip_patterns removes first
+    tokens = [word for summary in pd.read_csv(csv_path, usecols=['Summary'])['Summary'].dropna()
+              for word in special_characters.sub('', summary.lower()).split()]
+    corrector = scraping.SpellCorrector(scraping.get_spell_checker(), path=None)
+
+    def correct():
+        return [corrector.correct(word) for word in tokens]
+
+    results = {}
+    for name, passes, warmup in (('preprocess.spellcheck_cold', 1, 0), ('preprocess.spellcheck_warm', rounds, 1)):
+        corrector.stats = dict.fromkeys(corrector.stats, 0)
+        results[name] = run_benchmark(correct, len(tokens), passes, warmup)
+        results[name].update(hit_rate=round(corrector.hit_rate(), 4), stats=dict(corrector.stats))
+    return results
+
+
+# The scraped CSV shipped with the repository
+DEFAULT_SUMMARIES_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indeed_job.csv')
+
+# Modules whose import time is benchmarked, with the target in seconds
+IMPORT_TARGETS = {'code_webScraping': 0.1}
+
+
+# Dependencies a benchmark may need that are not installed (or models/corpora that are not downloaded)
+SKIPPED_ERRORS = (ImportError, LookupError, OSError)
+
+
+# Every benchmark of the suite as (name, setup) pairs; setup prepares the inputs and returns (fn, items),
+# or (fn, items, cleanup) when something has to be released once the benchmark is done
+def benchmark_suite(pages, csv_path, records, work_dir, server):
+    import pandas as pd
+    import code2_Analysis as analysis
+
+    replayed = [ReplayedPage(page) for page in pages]
+    cards = sum(len(scraping.find_job_cards(page)[0]) for page in replayed)
+    rows = sum(1 for _ in open(csv_path, encoding='utf-8')) - 1
+    now = pd.Timestamp('2024-06-14')
+    frame = pd.DataFrame(records, columns=['JobTitle', 'Company', 'Location', 'Salary', 'JobType', 'Summary', 'Date Posted', 'JobUrl'])
+    summaries = [summary.lower() for summary in frame['Summary']]
+
+    def fetch():
+        scraping.get_scraper()
+        scraping.get_headers()
+        urls = scraping.plan_page_urls('IT', 'Malaysia', len(pages))
+        return lambda: [response for _, response in scraping.fetch_pages(urls, max_workers=4)], len(urls)
+
+    # Fetch throughput (pages/s) over fetch workers, looking as many pages ahead as there are workers.
+    # The server answers after `latency` seconds, otherwise there is no round trip for workers to overlap
+    def fetch_workers(workers, latency=0.05):
+        def setup():
+            scraping.get_scraper()
+            scraping.get_headers()
+            urls = scraping.plan_page_urls('IT', 'Malaysia', len(pages))
+            original_prefetch = scraping.max_prefetch_pages
+            scraping.max_prefetch_pages = workers
+            server.latency = latency
+
+            def restore():
+                scraping.max_prefetch_pages = original_prefetch
+                server.latency = 0.0
+            return lambda: [response for _, response in scraping.fetch_pages(urls, max_workers=workers)], len(urls), restore
+        return setup
+
+    # Fetch through a response cache filled by one untimed pass; with ttl=0 every page is revalidated (304)
+    def fetch_cached(ttl):
+        def setup():
+            fn, items = fetch()
+            cache = scraping.ResponseCache(os.path.join(work_dir, 'http-cache-{}.sqlite'.format(ttl)), ttl=ttl)
+
+            def fetch_through_cache():
+                scraping.get_response_cache.value = cache  # What the lazy provider hands to fetch_page
+                try:
+                    fn()
+                finally:
+                    del scraping.get_response_cache.value
+            fetch_through_cache()
+            return fetch_through_cache, items
+        return setup
+
+    # Fetch with a fifth of the requests throttled or failing, retried with a short backoff
+    def fetch_faults():
+        fn, items = fetch()
+
+        def fetch_with_faults():
+            base, server.fault_rate, scraping.backoff_base = scraping.backoff_base, 0.2, 0.01
+            try:
+                responses = fn()
+            finally:
+                server.fault_rate, scraping.backoff_base = 0.0, base
+                scraping.rate_limiters.clear()  # Forget the throttled rate
+            if any(getattr(response, 'status_code', None) != 200 for response in responses):
+                raise RuntimeError('fetch.faults: some pages were not recovered by retries')
+        return fetch_with_faults, items
+
+    def crawl():
+        scraping.get_scraper()
+        scraping.get_headers()
+
+        def scrape():
+            with contextlib.redirect_stdout(io.StringIO()):  # scrape_jobs prints every URL
+                scraping.scrape_jobs('IT', 'Malaysia', max_pages=len(pages))
+        return scrape, len(pages)
+
+    def parse(backend):
+        def setup():
+            scraping.parser_backend = backend
+            return lambda: [scraping.parse_results_page(page) for page in replayed], cards
+        return setup
+
+    def strip_patterns():
+        cleaner = scraping.get_summary_cleaner()
+        return lambda: [cleaner.strip_patterns(summary) for summary in summaries], len(summaries)
+
+    def clean_summaries():
+        cleaner = scraping.get_summary_cleaner()
+        return lambda: [cleaner.clean(summary) for summary in summaries], len(summaries)
+
+    # T5 normalization in padded batches, and the baseline it replaced: one summary at a time with 4 beams
+    def t5(batch_size=None, num_beams=None):
+        def setup():
+            sample = summaries[:32]
+
+            def normalize():
+                scraping.t5_cache.clear()
+                scraping.normalize_texts_with_t5(sample, batch_size, num_beams)
+            scraping.get_t5()
+            return normalize, len(sample)
+        return setup
+
+    # process_job_data scaling over preprocessing workers, with greedy T5 decoding to keep rounds short.
+    # Every call gets fresh records, so the T5 and spell caches of the workers do not answer them.
+    def preprocess_workers(workers, size=64):
+        def setup():
+            import torch  # noqa: F401 -- skip when torch is missing (a worker failing to import it breaks the pool)
+            import transformers  # noqa: F401 -- skip when transformers is missing
+            original_beams = scraping.t5_num_beams
+            scraping.t5_num_beams = 1
+            pool = scraping.preprocessing_pool(workers) if workers > 1 else None
+            batches = itertools.cycle([generate_scraped_records(size, seed=1000 + batch) for batch in range(8)])
+
+            def cleanup():
+                scraping.t5_num_beams = original_beams
+                if pool is not None:
+                    pool.shutdown()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):  # preprocess_summaries prints the spell cache stats
+                    scraping.process_job_data(next(batches), workers, now, pool)  # Load the models (in every worker)
+            except BaseException:
+                cleanup()
+                raise
+
+            def process():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scraping.process_job_data(next(batches), workers, now, pool)
+            return process, size, cleanup
+        return setup
+
+    def column(fn, *args):
+        return lambda: (lambda: fn(*args), len(frame))
+
+    def analysis_load():
+        return lambda: analysis.read_jobs_csv(csv_path), rows
+
+    def analysis_prepare():
+        data = analysis.read_jobs_csv(csv_path)
+        return lambda: analysis.prepare_data(data), len(data)
+
+    def analysis_categorize():
+        titles = analysis.read_jobs_csv(csv_path)['JobTitle']
+        return lambda: analysis.JobCategorizer(analysis.job_categories).categorize_series(titles), len(titles)
+
+    def analysis_summarize():
+        data = analysis.prepare_data(analysis.read_jobs_csv(csv_path))
+        return lambda: analysis.summarize(data, top_k_tokens=5000), len(data)
+
+    def analysis_chunked():
+        cache_path = os.path.join(work_dir, 'summary.json')
+
+        def load():
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            analysis.load_summary(csv_path, cache_path, chunksize=50000, top_k_tokens=5000)
+        return load, rows
+
+    def analysis_parquet():
+        import pyarrow  # noqa: F401 -- skip when pyarrow is missing
+        parquet_path = os.path.join(work_dir, 'jobs.parquet')
+        analysis.convert_to_parquet(csv_path, parquet_path)
+        return lambda: analysis.summarize_chunks((analysis.prepare_data(chunk) for chunk in analysis.read_jobs_parquet(parquet_path)),
+                                                 top_k_tokens=5000), rows
+
+    def near_duplicates():
+        reposted = records + generate_reposts(records)
+        return lambda: scraping.drop_seen_duplicates(reposted, set(), scraping.NearDuplicateIndex()), len(reposted)
+
+    # Cleaned rows of the synthetic CSV as the scraper writes them, dates parsed back into datetimes
+    def cleaned_chunks(chunksize):
+        import pandas as pd
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            chunk['Date Posted'] = pd.to_datetime(chunk['Date Posted'], format='%d/%m/%Y')
+            yield chunk
+
+    def write(output):
+        def setup():
+            data = next(cleaned_chunks(50000))
+            path = os.path.join(work_dir, output)
+            return lambda: scraping.JobWriter(path).write(data), len(data)
+        return setup
+
+    def analysis_dataset():
+        import pyarrow  # noqa: F401 -- skip when pyarrow is missing
+        dataset_path = os.path.join(work_dir, 'jobs_dataset.parquet')
+        writer = scraping.JobWriter(dataset_path, crawl_date='2024-06-14')
+        for chunk in cleaned_chunks(100000):
+            writer.write(chunk)
+        return lambda: sum(len(chunk) for chunk in analysis.read_jobs_dataset(dataset_path)), rows
+
+    return [
+        ('fetch.pages', fetch),
+        ('fetch.workers_1', fetch_workers(1)),
+        ('fetch.workers_2', fetch_workers(2)),
+        ('fetch.workers_4', fetch_workers(4)),
+        ('fetch.workers_8', fetch_workers(8)),
+        ('fetch.cache_hits', fetch_cached(3600)),
+        ('fetch.cache_revalidated', fetch_cached(0)),
+        ('fetch.faults', fetch_faults),
+        ('fetch.crawl', crawl),
+        ('parse.html.parser', parse('html.parser')),
+        ('parse.lxml', parse('lxml')),
+        ('parse.selectolax', parse('selectolax')),
+        ('preprocess.strip_patterns', strip_patterns),
+        ('preprocess.clean', clean_summaries),
+        ('preprocess.t5_baseline', t5(batch_size=1, num_beams=4)),
+        ('preprocess.t5', t5()),
+        ('dedup.near_duplicates', near_duplicates),
+        ('preprocess.workers_1', preprocess_workers(1)),
+        ('preprocess.workers_2', preprocess_workers(2)),
+        ('preprocess.workers_4', preprocess_workers(4)),
+        ('preprocess.workers_8', preprocess_workers(8)),
+        ('clean.job_title', column(frame['JobTitle'].apply, scraping.clean_job_title)),
+        ('clean.salary', column(scraping.clean_salary_column, frame['Salary'])),
+        ('clean.job_type', column(scraping.clean_job_type_column, frame['JobType'])),
+        ('clean.date_posted', column(scraping.clean_date_posted_column, frame['Date Posted'], now)),
+        ('write.csv', write('write.csv')),
+        ('write.parquet', write('write.parquet')),
+        ('analysis.load', analysis_load),
+        ('analysis.load_dataset', analysis_dataset),
+        ('analysis.prepare_data', analysis_prepare),
+        ('analysis.categorize', analysis_categorize),
+        ('analysis.summarize', analysis_summarize),
+        ('analysis.load_summary_chunked', analysis_chunked),
+        ('analysis.summarize_parquet', analysis_parquet),
+    ]
+
+
+# Commit the benchmark ran on, marked dirty when the tree has uncommitted changes
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+# Run the suite (benchmarks whose name starts with one of `only`), returning the results document
+def run_suite(pages_dir=None, pages=20, rows=100000, records=5000, rounds=5, seed=0, only=None, summaries_csv=None):
+    work_dir = tempfile.mkdtemp(prefix='indeed-bench-')
+    original_base_url, original_backend, original_rate = scraping.BASE_URL, scraping.parser_backend, scraping.requests_per_second
+    results = {}
+    try:
+        page_sources = load_results_pages(pages_dir) if pages_dir else generate_results_pages(pages, seed=seed)
+        with ReplayServer(page_sources) as server:
+            # Everything the scraper builds from BASE_URL (search pages, next pages, job URLs) now points at the replay server
+            scraping.BASE_URL = server.base_url
+            scraping.requests_per_second = 1000  # The local server needs no politeness delay
+            scraping.rate_limiters.clear()
+            csv_path = generate_job_csv(os.path.join(work_dir, 'jobs.csv'), rows, seed)
+            scraped = generate_scraped_records(records, seed)
+
+            for name, setup in benchmark_suite(page_sources, csv_path, scraped, work_dir, server):
+                if only and not name.startswith(tuple(only)):
+                    continue
+                try:
+                    fn, items, *cleanup = setup()
+                    try:
+                        results[name] = run_benchmark(fn, items, rounds)
+                    finally:
+                        for release in cleanup:
+                            release()
+                    print('{:<36} median {:>9.4f}s  {:>14} items/s'.format(
+                        name, results[name]['median'], '{:,.1f}'.format(results[name]['items_per_second'] or 0)))
+                except SKIPPED_ERRORS as e:
+                    results[name] = {'skipped': '{}: {}'.format(type(e).__name__, e)}
+                    print('{:<36} skipped ({})'.format(name, results[name]['skipped'].splitlines()[0]))
+
+            # The warm pass reuses the cache of the cold one, so they always run together
+            spellcheck = ('preprocess.spellcheck_cold', 'preprocess.spellcheck_warm')
+            if not only or any(name.startswith(tuple(only)) for name in spellcheck):
+                try:
+                    for name, result in run_spellcheck_benchmark(summaries_csv or DEFAULT_SUMMARIES_CSV, rounds).items():
+                        results[name] = result
+                        print('{:<36} median {:>9.4f}s  {:>14} items/s  {:.1%} cache hits'.format(
+                            name, result['median'], '{:,.1f}'.format(result['items_per_second'] or 0), result['hit_rate']))
+                except SKIPPED_ERRORS as e:
+                    for name in spellcheck:
+                        results[name] = {'skipped': '{}: {}'.format(type(e).__name__, e)}
+                        print('{:<36} skipped ({})'.format(name, results[name]['skipped'].splitlines()[0]))
+
+            for module, target in IMPORT_TARGETS.items():
+                name = 'import.' + module
+                if only and not name.startswith(tuple(only)):
+                    continue
+                results[name] = run_import_benchmark(module, rounds, target)
+                print('{:<36} median {:>9.4f}s  {}'.format(
+                    name, results[name]['median'], 'within' if results[name]['within_target'] else 'OVER',
+                ) + ' the {:.0f} ms target'.format(target * 1000))
+    finally:
+        scraping.BASE_URL, scraping.parser_backend, scraping.requests_per_second = original_base_url, original_backend, original_rate
+        scraping.rate_limiters.clear()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'commit': git_commit(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'params': {'pages': len(page_sources), 'pages_dir': pages_dir, 'rows': rows, 'records': records,
+                   'rounds': rounds, 'seed': seed},
+        'benchmarks': results,
+    }
+
+
+# Compare two results documents on the median time, returning the benchmarks slower than `threshold`
+def compare_results(baseline, current, threshold=1.20):
+    print('\n{:<36} {:>12} {:>12} {:>8}   ({} -> {})'.format('benchmark', 'before s', 'after s', 'ratio',
+                                                           baseline.get('commit'), current.get('commit')))
+    regressions = []
+    for name, result in current['benchmarks'].items():
+        before = baseline['benchmarks'].get(name, {})
+        if 'median' not in result or 'median' not in before:
+            continue
+        ratio = result['median'] / before['median'] if before['median'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            flag = '  slower'
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        print('{:<36} {:>12.4f} {:>12.4f} {:>7.2f}x{}'.format(name, before['median'], result['median'], ratio, flag))
+    return regressions
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Offline benchmarks of the scraping and analysis pipeline')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier results JSON to compare against, exits with 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=1.20, help='Median time ratio counted as a regression')
+    parser.add_argument('--pages-dir', help='Directory of saved Indeed results pages (*.html) to replay instead of synthetic pages')
+    parser.add_argument('--pages', type=int, default=20, help='Number of synthetic results pages')
+    parser.add_argument('--rows', type=int, default=100000, help='Rows of the synthetic job CSV for the analysis benchmarks')
+    parser.add_argument('--records', type=int, default=5000, help='Synthetic scraped records for the cleaning benchmarks')
+    parser.add_argument('--summaries-csv', default=DEFAULT_SUMMARIES_CSV, help='Scraped CSV whose summary tokens the spell correction benchmark runs over')
+    parser.add_argument('--rounds', type=int, default=5, help='Timed rounds per benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data')
+    parser.add_argument('--only', help='Comma separated benchmark name prefixes to run, e.g. parse,clean')
+    parser.add_argument('--generate-csv', metavar='PATH', help='Only write a synthetic job CSV of --rows rows to PATH')
+    args = parser.parse_args()
+
+    if args.generate_csv:
+        generate_job_csv(args.generate_csv, args.rows, args.seed)
+        print('Wrote {:,d} synthetic job postings to {}'.format(args.rows, args.generate_csv))
+        sys.exit()
+
+    results = run_suite(args.pages_dir, args.pages, args.rows, args.records, args.rounds, args.seed,
+                        args.only.split(',') if args.only else None, args.summaries_csv)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print('Results written to {}'.format(args.output))
+    failed = False
+    over_target = [name for name, result in results['benchmarks'].items() if result.get('within_target') is False]
+    if over_target:
+        print('\nImports over their target: {}'.format(', '.join(over_target)))
+        failed = True
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(json.load(f), results, args.threshold)
+        if regressions:
+            print('\n{} benchmark(s) slower than {:.0%} of the baseline: {}'.format(
+                len(regressions), args.threshold - 1, ', '.join(regressions)))
+            failed = True
+    if failed:
+        sys.exit(1)
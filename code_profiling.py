@@ -0,0 +1,143 @@
+# Stage timing shared by code_webScraping and code2_Analysis: per-stage wall/CPU time, item counts and
+# throughput, written as a JSON run report, and optional cProfile/pyinstrument dumps of a whole run.
+# Only the standard library is imported, so both scripts can always import it.
+import contextlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+
+# CPU time of this process and of its finished child processes (preprocessing and report workers)
+def total_cpu_time():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+# Accumulates the time spent in each named stage. Stages may run in several threads at once
+# (page fetches), so CPU time is the CPU time of the thread running the stage.
+class StageTimer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.start_wall = time.perf_counter()
+            self.start_cpu = total_cpu_time()
+            self.started = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def add(self, name, wall=0.0, cpu=0.0, items=0, calls=1):
+        with self.lock:
+            stage = self.stages.setdefault(name, {'calls': 0, 'items': 0, 'wall': 0.0, 'cpu': 0.0})
+            stage['calls'] += calls
+            stage['items'] += items
+            stage['wall'] += wall
+            stage['cpu'] += cpu
+
+    # Time the block as one call of stage `name`. The yielded dict lets the block set its item count
+    # once it is known, e.g. the number of job cards found on a page.
+    @contextlib.contextmanager
+    def stage(self, name, items=0):
+        counts = {'items': items}
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield counts
+        finally:
+            self.add(name, time.perf_counter() - start_wall, time.thread_time() - start_cpu, counts['items'])
+
+    # Hand the stages recorded so far to another process (pool workers), and start over
+    def drain(self):
+        with self.lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    # Add the stages drained from another process
+    def merge(self, stages):
+        for name, stage in stages.items():
+            self.add(name, stage['wall'], stage['cpu'], stage['items'], stage['calls'])
+
+    def report(self, **info):
+        with self.lock:
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+        for stage in stages.values():
+            stage['items_per_second'] = round(stage['items'] / stage['wall'], 3) if stage['wall'] and stage['items'] else None
+            stage['wall'] = round(stage['wall'], 6)
+            stage['cpu'] = round(stage['cpu'], 6)
+        return {
+            'script': os.path.basename(sys.argv[0]),
+            'argv': sys.argv[1:],
+            'started': self.started,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'wall': round(time.perf_counter() - self.start_wall, 6),
+            'cpu': round(total_cpu_time() - self.start_cpu, 6),
+            'info': info,
+            # Stage times overlap when stages run concurrently or nest (fetch runs beside parse)
+            'stages': dict(sorted(stages.items(), key=lambda item: -item[1]['wall'])),
+        }
+
+    def write_report(self, path, **info):
+        report = self.report(**info)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+# Process-wide timer used by the scripts
+stage_timer = StageTimer()
+
+
+# Print the slowest stages of a run report
+def print_report(report, limit=15):
+    print('\n{:<36} {:>8} {:>10} {:>10} {:>10} {:>12}'.format('stage', 'calls', 'items', 'wall s', 'cpu s', 'items/s'))
+    for name, stage in list(report['stages'].items())[:limit]:
+        print('{:<36} {:>8,d} {:>10,d} {:>10.2f} {:>10.2f} {:>12}'.format(
+            name, stage['calls'], stage['items'], stage['wall'], stage['cpu'],
+            '{:,.1f}'.format(stage['items_per_second']) if stage['items_per_second'] else '-'))
+    print('Run: {:.1f}s wall, {:.1f}s CPU'.format(report['wall'], report['cpu']))
+
+
+# Profile the block with cProfile (stats file for pstats/snakeviz) or pyinstrument (HTML page).
+# Both only sample the calling thread, the fetch threads and pool processes show up as waits.
+@contextlib.contextmanager
+def profiled(path, profiler='cprofile'):
+    if profiler == 'pyinstrument':
+        from pyinstrument import Profiler  # Optional, only needed for this profiler
+        session = Profiler()
+        session.start()
+        try:
+            yield
+        finally:
+            session.stop()
+            with open(path, 'w') as f:
+                f.write(session.output_html())
+    else:
+        import cProfile
+        session = cProfile.Profile()
+        session.enable()
+        try:
+            yield
+        finally:
+            session.disable()
+            session.dump_stats(path)
+
+
+# Profile dump path next to the run report, or next to the script's output when there is no report
+def profile_path(base, profiler):
+    return os.path.splitext(base)[0] + ('.profile.html' if profiler == 'pyinstrument' else '.prof')
+
+
+# Iterate `iterable`, timing each step as one call of stage `name` with the length of the item as its count
+def timed_iter(name, iterable):
+    iterator = iter(iterable)
+    while True:
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        item = next(iterator, None)
+        if item is None:
+            return
+        stage_timer.add(name, time.perf_counter() - start_wall, time.thread_time() - start_cpu, len(item))
+        yield item
@@ -1,47 +1,462 @@
-from bs4 import BeautifulSoup
-import cloudscraper
-import requests
-import pandas as pd
-from fake_useragent import UserAgent
-import nltk    
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
+# Heavy third-party packages (pandas, bs4, cloudscraper, nltk, transformers, ...) are imported
+# inside the functions that need them, so importing this module stays instant
+import contextlib
+import functools
+import os
+import random
 import re
-from spellchecker import SpellChecker
-from transformers import T5ForConditionalGeneration, T5Tokenizer  #T5 Model
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse
 
-# Ensure the NLTK Resources are downloaded
-nltk.download('stopwords')
-nltk.download('punkt')
-nltk.download('wordnet')
+from code_profiling import stage_timer
+
+
+# Offline mode (INDEED_OFFLINE=1): never download NLTK corpora or models, fail fast when they are missing
+OFFLINE = os.environ.get('INDEED_OFFLINE', '') not in ('', '0')
+
+# Build a zero-argument resource once, on first use, and share it between threads
+def lazy_resource(loader):
+    lock = threading.Lock()
+
+    @functools.wraps(loader)
+    def provider():
+        with lock:
+            if not hasattr(provider, 'value'):
+                provider.value = loader()
+        return provider.value
+
+    return provider
+
+
+# NLTK resources used by the summary preprocessing, with their lookup path in nltk.data
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'wordnet': 'corpora/wordnet',
+}
+
+# Ensure the NLTK Resource is downloaded, the first time it is needed
+@functools.lru_cache(maxsize=None)
+def ensure_nltk_resource(resource):
+    import nltk
+    try:
+        nltk.data.find(NLTK_RESOURCES[resource])
+    except LookupError:
+        if OFFLINE:
+            raise LookupError("NLTK resource '{}' is missing and offline mode is on, run nltk.download('{}') first".format(resource, resource))
+        nltk.download(resource)
 
 # Load T5 model and tokenizer
-model_name = "t5-small"  
-tokenizer = T5Tokenizer.from_pretrained(model_name)
-model = T5ForConditionalGeneration.from_pretrained(model_name)
+model_name = "t5-small"
 
+@lazy_resource
+def get_t5():
+    from transformers import T5ForConditionalGeneration, T5Tokenizer  #T5 Model
+    tokenizer = T5Tokenizer.from_pretrained(model_name, local_files_only=OFFLINE)
+    model = T5ForConditionalGeneration.from_pretrained(model_name, local_files_only=OFFLINE)
+    return tokenizer, model
 
 # Generate a random user-agent
-ua = UserAgent()
-headers = {
-    'User-Agent': ua.random
-}
+@lazy_resource
+def get_user_agent():
+    from fake_useragent import UserAgent
+    return UserAgent()
+
+@lazy_resource
+def get_headers():
+    return {
+        'User-Agent': get_user_agent().random
+    }
 
 # Create a cloudscraper instance to bypass Cloudflare protection (*only reduce the chance of being blocked)
-scraper = cloudscraper.create_scraper()
+@lazy_resource
+def get_scraper():
+    import cloudscraper
+    return cloudscraper.create_scraper()
 
 # Initialize the spell checker
-spell = SpellChecker()
+@lazy_resource
+def get_spell_checker():
+    from spellchecker import SpellChecker
+    return SpellChecker()
+
+# Indeed site root, used to build search and job URLs (point it at a local server to replay saved pages)
+BASE_URL = "https://malaysia.indeed.com"
 
-# Indeed URL for website scraping
+# Indeed shows 10 job cards per results page, the `&start=` offset moves in steps of 10
+RESULTS_PER_PAGE = 10
+
+# Indeed URL for website scraping, with the title and location encoded ("R&D Engineer", "C++ Developer")
 def generate_url(job_title, job_location):
-    url_template = "https://malaysia.indeed.com/jobs?q={}&l={}"
-    url = url_template.format(job_title, job_location)
-    return url
+    return BASE_URL + "/jobs?" + urlencode({'q': job_title, 'l': job_location})
+
+# Plan the results page URLs ahead of time, so they can be fetched concurrently
+def plan_page_urls(job_title, job_location, max_pages):
+    url = generate_url(job_title, job_location)
+    return [url] + ["{}&start={}".format(url, page * RESULTS_PER_PAGE) for page in range(1, max_pages)]
+
+
+# Token bucket rate limiter, refills `rate` tokens per second up to `burst`. The rate adapts between
+# `min_rate` and `max_rate`: halved on every throttle, raised by a quarter after `speed_up_after` successes.
+class RateLimiter:
+    def __init__(self, rate, burst=1, min_rate=None, max_rate=None, speed_up_after=20):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = rate if min_rate is None else min_rate
+        self.max_rate = rate if max_rate is None else max_rate
+        self.speed_up_after = speed_up_after
+        self.successes = 0
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    # Block until a token is available
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    # The host throttled us: halve the rate, and hold every worker back for `delay` seconds
+    def slow_down(self, delay=0.0):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.successes = 0
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    # A request went through: after enough of them in a row, try a faster rate again
+    def succeeded(self):
+        with self.lock:
+            self.successes += 1
+            if self.successes >= self.speed_up_after:
+                self.rate = min(self.max_rate, self.rate * 1.25)
+                self.successes = 0
+
+
+# One rate limiter per host, shared by every fetch worker. The rate starts at `requests_per_second`
+# and adapts between the min and max below.
+requests_per_second = 2
+min_requests_per_second = 0.1
+max_requests_per_second = 4
+rate_limiters = {}
+rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(url):
+    host = urlparse(url).netloc
+    with rate_limiters_lock:
+        if host not in rate_limiters:
+            rate_limiters[host] = RateLimiter(requests_per_second, min_rate=min(min_requests_per_second, requests_per_second),
+                                              max_rate=max(max_requests_per_second, requests_per_second))
+        return rate_limiters[host]
+
+
+# Retry settings: attempts after the first one, exponential backoff base and cap in seconds (with full
+# jitter), the longest Retry-After we wait for, and the per-request timeout
+max_retries = 4
+backoff_base = 1.0
+backoff_cap = 60.0
+max_retry_after = 300.0
+request_timeout = 30
+
+# Statuses worth retrying: throttled (429) and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Statuses that count as a fetched page. Anything else (a 403 block, a 404 past the last page) is neither
+# retried nor taken as a sign that the host can go faster
+OK_STATUSES = {200, 304}
+
+# Per-run fetch statistics, shared by every fetch worker and reset when a crawl starts
+fetch_stats = {'requests': 0, 'pages': 0, 'failed': 0, 'retries': 0, 'throttled': 0, 'server_errors': 0,
+               'network_errors': 0, 'gave_up': 0, 'backoff_seconds': 0.0}
+fetch_stats_lock = threading.Lock()
+
+def count_fetch(**counts):
+    with fetch_stats_lock:
+        for name, value in counts.items():
+            fetch_stats[name] += value
+
+def reset_fetch_stats():
+    with fetch_stats_lock:
+        fetch_stats.update(dict.fromkeys(fetch_stats, 0))
+
+
+# Seconds to wait from a Retry-After header (delta seconds or an HTTP date), None when absent or unreadable
+def parse_retry_after(value):
+    from email.utils import parsedate_to_datetime
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Backoff before retry number `attempt` (0-based): full jitter over an exponentially growing window
+def backoff_delay(attempt):
+    return random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+
+# On-disk HTTP response cache settings (opt-in): sqlite file, seconds a response is served without
+# revalidation, size bound of the compressed bodies, and replay-only mode (never touch the network)
+response_cache_path = os.environ.get('INDEED_HTTP_CACHE')
+response_cache_ttl = 6 * 3600
+response_cache_max_bytes = 500 * 1024 * 1024
+response_cache_replay = False
+
+# Request headers left out of the cache key: the user agent is picked at random for every run
+RESPONSE_CACHE_IGNORED_HEADERS = {'user-agent'}
+
+# Response headers that describe the transfer rather than the (already decoded) body
+RESPONSE_CACHE_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+# Cache of 200 responses in sqlite, keyed by URL and request headers, with zlib-compressed bodies.
+# Fresh entries (younger than `ttl`) are served straight from disk; stale entries are revalidated with
+# If-None-Match/If-Modified-Since, so an unchanged page costs a 304 instead of a full download. The least
+# recently used entries are evicted once the bodies exceed `max_bytes`. With `replay_only`, every entry is
+# served regardless of its age and a miss fails like a network error.
+class ResponseCache:
+    def __init__(self, path, ttl=None, max_bytes=None, replay_only=False):
+        import sqlite3
+
+        self.ttl = response_cache_ttl if ttl is None else ttl
+        self.max_bytes = response_cache_max_bytes if max_bytes is None else max_bytes
+        self.replay_only = replay_only
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')  # A cache can lose its last writes on power loss
+        self.db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, '
+                        'headers TEXT NOT NULL, encoding TEXT, body BLOB NOT NULL, size INTEGER NOT NULL, '
+                        'stored_at REAL NOT NULL, accessed_at REAL NOT NULL)')
+        self.size = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def key(self, url, headers):
+        import hashlib
+        varying = sorted((name.lower(), value) for name, value in (headers or {}).items()
+                         if name.lower() not in RESPONSE_CACHE_IGNORED_HEADERS)
+        return hashlib.sha1(repr((url, varying)).encode('utf-8')).hexdigest()
+
+    # Cached response for `key` when it can be served without the network, else None
+    def lookup(self, key, url):
+        import requests
+        with self.lock:
+            row = self.db.execute('SELECT status, headers, encoding, body, stored_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and (self.replay_only or time.time() - row[4] < self.ttl):
+                self.stats['hits'] += 1
+                # Access times only order the eviction, they are committed with the next write or flush
+                self.db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+                return self.build_response(url, *row[:4])
+            if self.replay_only:
+                self.stats['misses'] += 1
+                raise requests.ConnectionError('{} is not in the response cache (replay-only mode)'.format(url))
+        return None
+
+    # Request headers revalidating a stale entry, when the server sent a validator for it
+    def revalidation_headers(self, key, headers):
+        import json
+        with self.lock:
+            row = self.db.execute('SELECT headers FROM responses WHERE key = ?', (key,)).fetchone()
+        headers = dict(headers or {})
+        if row is not None:
+            stored = {name.lower(): value for name, value in json.loads(row[0]).items()}
+            if 'etag' in stored:
+                headers['If-None-Match'] = stored['etag']
+            if 'last-modified' in stored:
+                headers['If-Modified-Since'] = stored['last-modified']
+        return headers
+
+    # Store a fresh 200 response, or turn a 304 into the cached response; other responses pass through
+    def store(self, key, url, response):
+        import json
+        import zlib
+
+        with self.lock:
+            now = time.time()
+            if response.status_code == 304:
+                row = self.db.execute('SELECT status, headers, encoding, body FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    self.stats['revalidated'] += 1
+                    self.db.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?', (now, now, key))
+                    self.flush()
+                    return self.build_response(url, *row)
+                return response
+
+            self.stats['misses'] += 1
+            if response.status_code != 200:
+                return response  # Never cache blocks, 429s or errors
+
+            headers = {name: value for name, value in response.headers.items() if name.lower() not in RESPONSE_CACHE_DROPPED_HEADERS}
+            body = zlib.compress(response.content, 6)
+            old = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            (key, url, response.status_code, json.dumps(headers), response.encoding, body, len(body), now, now))
+            self.size += len(body) - (old[0] if old else 0)
+            self.stats['stored'] += 1
+            self.evict()
+            self.flush()
+        return response
+
+    # Drop the least recently used entries until the bodies fit in max_bytes (called with the lock held)
+    def evict(self):
+        while self.size > self.max_bytes:
+            row = self.db.execute('SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1').fetchone()
+            if row is None:
+                break
+            self.db.execute('DELETE FROM responses WHERE key = ?', (row[0],))
+            self.size -= row[1]
+            self.stats['evicted'] += 1
+
+    # Commit pending writes (called with the lock held, or once the crawl is done)
+    def flush(self):
+        self.db.commit()
+
+    @staticmethod
+    def build_response(url, status, headers, encoding, body):
+        import json
+        import zlib
+        import requests
+
+        response = requests.models.Response()
+        response.url = url
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(json.loads(headers))
+        response.encoding = encoding
+        response._content = zlib.decompress(body)
+        return response
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.db.close()
+
+
+# The response cache, or None when it is not enabled
+@lazy_resource
+def get_response_cache():
+    if not response_cache_path:
+        return None
+    return ResponseCache(response_cache_path, replay_only=response_cache_replay)
+
+
+# Fetch a single page through the shared scraper session, returning the exception on network errors.
+# With the response cache enabled, cached pages skip the rate limiter and the network entirely.
+# Throttles (429), transient server errors and network errors are retried up to `max_retries` times
+# with jittered exponential backoff (or the server's Retry-After) and a fresh user agent.
+def fetch_page(url):
+    import requests
+    headers = get_headers()
+    cache = get_response_cache()
+    if cache is not None:
+        key = cache.key(url, headers)
+        try:
+            with stage_timer.stage('response_cache', 1):
+                cached = cache.lookup(key, url)
+        except requests.RequestException as e:
+            return e
+        if cached is not None:
+            return cached
+        headers = cache.revalidation_headers(key, headers)
+
+    limiter = get_rate_limiter(url)
+    for attempt in range(max_retries + 1):
+        with stage_timer.stage('rate_limit_wait'):
+            limiter.acquire()
+        count_fetch(requests=1)
+        retry_after = None
+        try:
+            with stage_timer.stage('fetch', 1):
+                response = get_scraper().get(url, headers=headers, timeout=request_timeout)
+        except requests.RequestException as e:
+            result = e
+            count_fetch(network_errors=1)
+        else:
+            if response.status_code in OK_STATUSES:
+                limiter.succeeded()
+                count_fetch(pages=1)
+                return response if cache is None else cache.store(key, url, response)
+            if response.status_code not in RETRY_STATUSES:
+                count_fetch(failed=1)
+                return response if cache is None else cache.store(key, url, response)
+            result = response
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code == 429:
+                count_fetch(throttled=1)
+            else:
+                count_fetch(server_errors=1)
+
+        if attempt == max_retries or (retry_after or 0) > max_retry_after:
+            break
+        delay = max(retry_after or 0.0, backoff_delay(attempt))
+        if getattr(result, 'status_code', None) == 429:
+            limiter.slow_down(delay)  # Every worker on this host waits, not just this one
+        count_fetch(retries=1, backoff_seconds=delay)
+
+        # Come back as a different browser
+        headers = dict(headers, **{'User-Agent': get_user_agent().random})
+        with stage_timer.stage('retry_backoff'):
+            time.sleep(delay)
+
+    count_fetch(gave_up=1)
+    return result
+
+# Planned pages requested ahead of the one being consumed. Each one past the last page of a query is a
+# wasted request (and a rate-limit token), so this stays small however many fetch workers there are
+max_prefetch_pages = 2
+
+# Fetch pages with a bounded worker pool, yielding (url, response) in page order
+def fetch_pages(urls, max_workers=4, executor=None):
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    urls = iter(urls)
+    pending = deque()
+    window = 1
+    try:
+        # The planned pages may not exist, so only the first page is fetched at first. Every page the consumer
+        # asks for lets the window grow by a page, up to max_prefetch_pages ahead of the page being consumed
+        # (and a couple per worker), so at most max_prefetch_pages requests are made past the last page.
+        while True:
+            while len(pending) < window:
+                url = next(urls, None)
+                if url is None:
+                    break
+                pending.append((url, executor.submit(fetch_page, url)))
+            if not pending:
+                break
+
+            url, future = pending.popleft()
+            yield url, future.result()
+            window = min(window + 1, max_workers * 2, max_prefetch_pages + 1)
+    finally:
+        # The consumer stopped early (last page reached), drop the pages we no longer need
+        for _, future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
 
 # Collect job cards from page
 def collect_job_cards_from_page(html):
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html.text, 'html.parser')
     cards = soup.find_all('div', class_='job_seen_beacon')
     return cards, soup
@@ -50,7 +465,7 @@ def collect_job_cards_from_page(html):
 def find_next_page(soup):
     try:
         pagination = soup.find("a", {"aria-label": "Next Page"}).get("href")
-        return "https://malaysia.indeed.com" + pagination
+        return BASE_URL + pagination
     except AttributeError:
         return None
 
@@ -102,73 +517,387 @@ def extract_job_card_data(card):
     except AttributeError:
         date_posted = ''
 
-    job_url = 'https://malaysia.indeed.com' + atag.get('href')
+    job_url = job_card_url(atag.get('href'), atag.get('data-jk'))
     return job_title, company, location, salary, job_types, summary, date_posted, job_url
 
 
+# HTML parser backend for results pages: 'html.parser' (full BeautifulSoup tree), 'lxml' (BeautifulSoup
+# with lxml, only the job cards are parsed) or 'selectolax' (lexbor, fastest)
+parser_backend = 'html.parser'
+
+# Card fields as (field, tag, attribute, value), in the order extract_job_card_data returns them.
+# A 'class' value matches one of the tag's classes, or its whole class attribute when it has spaces,
+# the same way BeautifulSoup's class_ does.
+CARD_FIELDS = [
+    ('job_title', 'h2', 'class', 'jobTitle'),
+    ('company', 'span', 'data-testid', 'company-name'),
+    ('location', 'div', 'data-testid', 'text-location'),
+    ('salary', 'div', 'class', 'salary-snippet-container'),
+    ('job_types', 'div', 'class', 'metadata css-5zy3wz eu4oa1w0'),
+    ('summary', 'div', 'class', 'css-9446fg eu4oa1w0'),
+    ('date_posted', 'span', 'class', 'css-qvloho eu4oa1w0'),
+]
+
+# The same table as CSS selectors, for selectolax
+CARD_FIELD_SELECTORS = [
+    (field, '{}[class="{}"]'.format(tag, value) if attribute == 'class' and ' ' in value
+     else '{}.{}'.format(tag, value) if attribute == 'class'
+     else '{}[{}="{}"]'.format(tag, attribute, value))
+    for field, tag, attribute, value in CARD_FIELDS
+]
+
+# Job card class for SoupStrainer: cards carry several classes ("cardOutline tapItem ... job_seen_beacon"),
+# and since BeautifulSoup 4.13 a plain class_ string in a SoupStrainer only matches a card with no other class
+JOB_CARD_CLASS = re.compile(r'(?:^|\s)job_seen_beacon(?:\s|$)')
+
+# The "Next Page" link, found straight in the page source when the pagination is not parsed
+NEXT_PAGE_TAG = re.compile(r'<a\b[^>]*\baria-label="Next Page"[^>]*>')
+HREF_ATTRIBUTE = re.compile(r'\bhref="([^"]*)"')
+
+
+def find_next_page_in_source(text):
+    import html
+    tag = NEXT_PAGE_TAG.search(text)
+    href = HREF_ATTRIBUTE.search(tag.group()) if tag else None
+    return BASE_URL + html.unescape(href.group(1)) if href else None
+
+
+# Check a BeautifulSoup tag against one CARD_FIELDS entry
+def card_field_matches(tag, name, attribute, value):
+    if tag.name != name:
+        return False
+    found = tag.get(attribute)
+    if attribute == 'class' and found:
+        return value in found or ' '.join(found) == value
+    return found == value
+
+
+# Read the summary text, joining the list items when the summary is a bullet list
+def summary_text(summary_items, summary_text):
+    if summary_items:
+        return ' '.join(item.strip() for item in summary_items)
+    return summary_text.strip()
+
+
+# Same record as extract_job_card_data, collecting every field in a single walk over the card
+def extract_job_card_data_one_pass(card):
+    atag = card.h2.a
+    tags = {}
+    for tag in card.descendants:
+        if tag.name is None:  # Text node
+            continue
+        for field, name, attribute, value in CARD_FIELDS:
+            if field not in tags and card_field_matches(tag, name, attribute, value):
+                tags[field] = tag
+        if len(tags) == len(CARD_FIELDS):
+            break
+
+    def text(field, strip=False):
+        tag = tags.get(field)
+        if tag is None:
+            return ''
+        return tag.text.strip() if strip else tag.text
+
+    summary = tags.get('summary')
+    if summary is not None:
+        summary = summary_text([item.text for item in summary.find_all('li')], summary.text)
+
+    job_url = job_card_url(atag.get('href'), atag.get('data-jk'))
+    return (text('job_title'), text('company'), text('location'), text('salary'), text('job_types', strip=True),
+            summary, text('date_posted', strip=True), job_url)
+
+
+# Same record as extract_job_card_data, for a selectolax card node
+def extract_job_card_data_selectolax(card):
+    atag = card.css_first('h2 a')
+    nodes = {field: card.css_first(selector) for field, selector in CARD_FIELD_SELECTORS}
+
+    def text(field, strip=False):
+        node = nodes[field]
+        if node is None:
+            return ''
+        return node.text(deep=True).strip() if strip else node.text(deep=True)
+
+    summary = nodes['summary']
+    if summary is not None:
+        summary = summary_text([item.text(deep=True) for item in summary.css('li')], summary.text(deep=True))
+
+    job_url = job_card_url(atag.attributes.get('href'), atag.attributes.get('data-jk'))
+    return (text('job_title'), text('company'), text('location'), text('salary'), text('job_types', strip=True),
+            summary, text('date_posted', strip=True), job_url)
+
+
+# Find the job cards and the next page link of a results page, with the card extractor of the configured backend
+def find_job_cards(html):
+    if parser_backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(html.text)
+        cards = tree.css('div.job_seen_beacon')
+        next_page = tree.css_first('a[aria-label="Next Page"]')
+        next_url = BASE_URL + next_page.attributes['href'] if next_page is not None and next_page.attributes.get('href') else None
+        return cards, next_url, extract_job_card_data_selectolax
+
+    if parser_backend == 'lxml':
+        from bs4 import BeautifulSoup, SoupStrainer
+        # Only the job cards are turned into a tree, the pagination link is read from the source
+        soup = BeautifulSoup(html.text, 'lxml', parse_only=SoupStrainer('div', class_=JOB_CARD_CLASS))
+        cards = soup.find_all('div', class_='job_seen_beacon')
+        return cards, find_next_page_in_source(html.text), extract_job_card_data_one_pass
+
+    cards, soup = collect_job_cards_from_page(html)
+    return cards, find_next_page(soup), extract_job_card_data
+
+# Parse a results page with the configured backend into (records, next_page_url)
+def parse_results_page(html):
+    with stage_timer.stage('parse', 1):
+        cards, next_url, extract = find_job_cards(html)
+    with stage_timer.stage('extract_job_card_data', len(cards)):
+        return [extract(card) for card in cards], next_url
+
+
+# T5 normalization settings: summaries per padded batch, beams (1 = greedy decoding, much faster on CPU)
+# and the longest output in tokens
+t5_batch_size = 16
+t5_num_beams = 4
+t5_max_length = 512
+
+# Content-hash LRU cache of T5 outputs, so repeated summaries are not regenerated, bounded so memory
+# stays flat on long crawls. The decoding options are part of the key: greedy and beam outputs differ
+t5_cache_size = 50000
+t5_cache = OrderedDict()
+
+# Normalize a list of texts with the T5 model in padded batches, reusing cached outputs
+def normalize_texts_with_t5(texts, batch_size=None, num_beams=None):
+    import hashlib
+    import torch
+
+    batch_size = batch_size or t5_batch_size
+    num_beams = num_beams or t5_num_beams
+
+    # Only generate for summaries we have not normalized before with these options
+    options = '{}:{}:'.format(num_beams, t5_max_length)
+    keys = [hashlib.sha1((options + text).encode('utf-8')).hexdigest() for text in texts]
+    normalized = {}  # Outputs for this call, they may be evicted from the cache before it returns
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key in t5_cache:
+            t5_cache.move_to_end(key)
+            normalized[key] = t5_cache[key]
+        else:
+            pending[key] = text
+    pending = list(pending.items())
+
+    if pending:
+        tokenizer, model = get_t5()
+        generate_options = {'max_length': t5_max_length, 'num_beams': num_beams}
+        if num_beams > 1:
+            generate_options['early_stopping'] = True
+
+        with stage_timer.stage('t5', len(pending)), torch.inference_mode():
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+
+                # Prepare the input text for the T5 model
+                inputs = tokenizer([f"normalize: {text}" for _, text in batch], return_tensors="pt",
+                                   padding=True, truncation=True, max_length=512)
+
+                # Generate the normalized text
+                output_ids = model.generate(**inputs, **generate_options)
+                for (key, _), normalized_text in zip(batch, tokenizer.batch_decode(output_ids, skip_special_tokens=True)):
+                    normalized[key] = t5_cache[key] = normalized_text
+                    if len(t5_cache) > t5_cache_size:
+                        t5_cache.popitem(last=False)
+
+    return [normalized[key] for key in keys]
+
 # Normalize text using T5 model (We selected to use Normalizing Tokens)
 def normalize_text_with_t5(text):
-    # Prepare the input text for the T5 model
-    input_text = f"normalize: {text}"
-    input_ids = tokenizer.encode(input_text, return_tensors="pt")
+    return normalize_texts_with_t5([text])[0]
 
-    # Generate the normalized text
-    output_ids = model.generate(input_ids, max_length=512, num_beams=4, early_stopping=True)
-    normalized_text = tokenizer.decode(output_ids[0], skip_special_tokens=True)
-    
-    return normalized_text
 
+# Spell correction cache settings: in-process LRU size, and an optional sqlite file that persists across crawls
+spell_cache_size = 50000
+spell_cache_path = os.environ.get('INDEED_SPELL_CACHE')
+
+# Memoized spell correction: known words skip the edit-distance search entirely, other words are
+# looked up in a bounded LRU, then in the on-disk store, and only corrected when both miss.
+# Every preprocessing worker shares the on-disk store: new corrections are buffered and written in one
+# short transaction per batch (WAL mode, so lookups never wait for a writer).
+class SpellCorrector:
+    def __init__(self, spell, max_size=None, path=None):
+        from collections import OrderedDict
+
+        self.spell = spell
+        self.max_size = spell_cache_size if max_size is None else max_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'known': 0, 'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        self.db = None
+        self.pending = {}  # Corrections not written to the on-disk store yet
+        if path:
+            import sqlite3
+            self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('CREATE TABLE IF NOT EXISTS corrections (word TEXT PRIMARY KEY, correction TEXT NOT NULL)')
+
+    # Keep the word when the spell checker has no correction for it
+    def correct(self, word):
+        if word in self.spell.word_frequency.dictionary:
+            self.stats['known'] += 1
+            return word
+
+        with self.lock:
+            if word in self.cache:
+                self.cache.move_to_end(word)
+                self.stats['hits'] += 1
+                return self.cache[word]
+
+            correction = None
+            if self.db is not None:
+                row = self.db.execute('SELECT correction FROM corrections WHERE word = ?', (word,)).fetchone()
+                if row is not None:
+                    correction = row[0]
+                    self.stats['disk_hits'] += 1
+
+            if correction is None:
+                self.stats['misses'] += 1
+                correction = self.spell.correction(word)
+                if correction is None:
+                    correction = word
+                if self.db is not None:
+                    self.pending[word] = correction
+                    if len(self.pending) >= 100:
+                        self.flush()
+
+            self.cache[word] = correction
+            if len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+            return correction
+
+    # Write pending corrections to the on-disk store. When another worker keeps it locked past the
+    # timeout they stay pending for the next flush, the store is only a cache.
+    def flush(self):
+        import sqlite3
+        if self.db is not None and self.pending:
+            try:
+                with self.db:
+                    self.db.executemany('INSERT OR REPLACE INTO corrections VALUES (?, ?)', list(self.pending.items()))
+            except sqlite3.OperationalError as e:
+                print('Spell cache not saved, will retry: {}'.format(e))
+                return
+            self.pending = {}
+
+    # Share of lookups answered without running the spell checker
+    def hit_rate(self):
+        total = sum(self.stats.values())
+        return (total - self.stats['misses']) / total if total else 0.0
 
-# Preprocess text data
-def preprocess_summary(text):
 
+@lazy_resource
+def get_spell_corrector():
+    return SpellCorrector(get_spell_checker(), path=spell_cache_path)
+
+
+# Define patterns to remove from job summaries, applied in this order
+patterns_to_remove = [
+    "duration", "responsibilit(y|ies)", "responsible", "experience", "understanding", "field",
+    "provided","provide", "qualification", "year", "coordinate", "ability", "meal", "allowance",        
+    "company", "team", "requirement", "user", "product", "quality", "high", "ensure","need",
+    "advantage", "assist", "team", "would", "fulltime", "parttime", "intern", "free", "parking",
+    "working", "hour", "benefit", "bonus", "medical", "insurance", "annual", "leave", "career",
+    "opportunity", "good", "environment", "training", "must", "salary", "range", "month",
+    "flexible", "multiple", "location", "job", "description", "health", "assistance","matching","etc",
+    "preferred","printer","scanner","fax","machine","faxing","photocopy","photocopying","photostat",
+    "body", "log", "basic", "real", "including", "permanent", "temporary", "contract", "shift", "day",
+    "minimum", "maximum", "objective", "create", "per", "recommendation", "recommend", "recommendations"
+]
+
+
+# Precompiled summary cleaning pipeline, built once and reused for every row.
+# The patterns are still removed one after another in list order: removing one pattern can join the
+# text around it into a match for a later one ("teyearam" -> "team" -> ""), which a single-pass
+# alternation would miss. Plain words are removed with str.replace and only the real regexes go
+# through re, and a combined alternation skips texts that contain no pattern at all.
+class SummaryCleaner:
+    def __init__(self, patterns=None):
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        from nltk.tokenize import word_tokenize
+
+        for resource in NLTK_RESOURCES:
+            ensure_nltk_resource(resource)
+
+        patterns = patterns_to_remove if patterns is None else patterns
+        self.special_characters = re.compile(r"[^a-zA-Z0-9\s]")
+        self.any_pattern = re.compile('|'.join('(?:{})'.format(pattern) for pattern in patterns))
+        self.removals = [(pattern, None) if re.escape(pattern) == pattern else (None, re.compile(pattern)) for pattern in patterns]
+
+        self.word_tokenize = word_tokenize
+        self.stop_words = set(stopwords.words('english'))
+        self.lemmatizer = WordNetLemmatizer()
+        self.spell = get_spell_corrector()
+
+    # Remove special characters, punctuation and the unwanted patterns
+    def strip_patterns(self, text):
+        text = self.special_characters.sub('', text)
+        if not self.any_pattern.search(text):
+            return text
+        for word, regex in self.removals:
+            text = text.replace(word, '') if regex is None else regex.sub('', text)
+        return text
+
+    # Tokenize, drop stopwords, spell correct and lemmatize the normalized summary
+    def clean(self, normalized_text):
+        with stage_timer.stage('regex', 1):
+            text = self.strip_patterns(normalized_text)
+
+        with stage_timer.stage('tokenize', 1):
+            # Tokenize the text
+            tokens = self.word_tokenize(text)
+
+            # Remove stopwords
+            filtered_tokens = [word for word in tokens if word.lower() not in self.stop_words]
+
+        # Spell check and correct the tokens
+        with stage_timer.stage('spellcheck', len(filtered_tokens)):
+            corrected_tokens = [self.spell.correct(word) for word in filtered_tokens]
+
+        # Apply lemmatization to filtered tokens
+        with stage_timer.stage('lemmatize', len(corrected_tokens)):
+            lemmatized_tokens = [self.lemmatizer.lemmatize(word) for word in corrected_tokens]
+
+        # Join the lemmatized tokens back into a single string
+        return ' '.join(lemmatized_tokens)
+
+
+@lazy_resource
+def get_summary_cleaner():
+    return SummaryCleaner()
+
+
+# Preprocess text data, `normalized_text` is the T5 output when it was already computed in a batch
+def preprocess_summary(text, normalized_text=None):
     # Convert text to lowercase
     text = text.lower()
 
-    # Normalize text using T5 model
-    normalized_text = normalize_text_with_t5(text)
-
-    # Define patterns to remove
-    patterns_to_remove = [
-        "duration", "responsibilit(y|ies)", "responsible", "experience", "understanding", "field",
-        "provided","provide", "qualification", "year", "coordinate", "ability", "meal", "allowance",        
-        "company", "team", "requirement", "user", "product", "quality", "high", "ensure","need",
-        "advantage", "assist", "team", "would", "fulltime", "parttime", "intern", "free", "parking",
-        "working", "hour", "benefit", "bonus", "medical", "insurance", "annual", "leave", "career",
-        "opportunity", "good", "environment", "training", "must", "salary", "range", "month",
-        "flexible", "multiple", "location", "job", "description", "health", "assistance","matching","etc",
-        "preferred","printer","scanner","fax","machine","faxing","photocopy","photocopying","photostat",
-        "body", "log", "basic", "real", "including", "permanent", "temporary", "contract", "shift", "day",
-        "minimum", "maximum", "objective", "create", "per", "recommendation", "recommend", "recommendations"
-    ]
-
-    # Remove special characters and punctuation
-    normalized_text = re.sub( r"[^a-zA-Z0-9\s]", '', text)
-
-    # Remove patterns
-    for pattern in patterns_to_remove:
-        normalized_text = re.sub(pattern, '', normalized_text)
-
-    # Tokenize the text
-    tokens = word_tokenize(normalized_text)
-
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [word for word in tokens if word.lower() not in stop_words]
-
-    # Spell check and correct the tokens
-    corrected_tokens = [spell.correction(word) if spell.correction(word) is not None else word for word in filtered_tokens]
-    
-    # Initialize WordNetLemmatizer
-    lemmatizer = WordNetLemmatizer()
+    # Normalize text using T5 model, falling back to the raw text when the model returns nothing
+    if normalized_text is None:
+        normalized_text = normalize_text_with_t5(text)
+    normalized_text = normalized_text.lower() if normalized_text.strip() else text
 
-    # Apply lemmatization to filtered tokens
-    lemmatized_tokens = [lemmatizer.lemmatize(word) for word in corrected_tokens]
-    
-    # Join the lemmatized tokens back into a single string
-    clean_text = ' '.join(lemmatized_tokens)
-    
-    return clean_text
+    return get_summary_cleaner().clean(normalized_text)
+
+# Preprocess a column of summaries, running the T5 normalization over the whole column in batches
+def preprocess_summaries(texts):
+    texts = [text.lower() for text in texts]
+    normalized_texts = normalize_texts_with_t5(texts)
+    clean_texts = [preprocess_summary(text, normalized_text) for text, normalized_text in zip(texts, normalized_texts)]
+
+    corrector = get_spell_corrector()
+    corrector.flush()
+    print('Spell correction: {:.1%} of tokens served without the spell checker {}'.format(corrector.hit_rate(), corrector.stats))
+    return clean_texts
 
 # Clean salary data
 def clean_salary_data(salary):
@@ -213,6 +942,7 @@ def clean_job_title(job_title):
 
 # Clean the 'Date Posted' column
 def clean_date_posted(date_posted):
+    import pandas as pd
     if pd.isnull(date_posted) or date_posted == '':
         return pd.NaT
 
@@ -235,20 +965,185 @@ def clean_date_posted(date_posted):
             return pd.NaT  # Return NaT if the date is not in the expected format
 
 
-def main(job_title, job_location, filepath):
-    job_data = []  # List to store job data
-    unique_jobs = set()  # Track job URLs to avoid collecting duplicate records
-    print("Starting to scrape Indeed for `{}` in `{}`".format(job_title, job_location))
-    url = generate_url(job_title, job_location)
+# Column-level versions of the cleaning functions above, for a whole Series in one go.
+# They return typed columns instead of Python objects.
+
+# Scraped columns repeat a handful of distinct strings, so clean the distinct values once and map back
+def clean_distinct_values(clean, values, *args):
+    import pandas as pd
+    codes, uniques = pd.factorize(values)
+    cleaned = clean(pd.Series(uniques, dtype=object), *args)
+    if isinstance(cleaned, tuple):
+        return tuple(column.reindex(codes).set_axis(values.index) for column in cleaned)
+    return cleaned.reindex(codes).set_axis(values.index)
+
+# Clean a salary column into float64 (min, max) columns; unparsable salaries become NaN instead of raising
+def clean_salary_column(salaries):
+    return clean_distinct_values(clean_salary_values, salaries)
+
+def clean_salary_values(salaries):
+    import pandas as pd
+
+    # Remove non-numeric characters except for '-' and '.'
+    salaries = salaries.fillna('').astype(str).str.replace(r'[^\d\.-]', '', regex=True)
+    is_range = salaries.str.count('-') == 1
+    salary_range = salaries.str.partition('-')
+
+    min_salary = pd.to_numeric(salary_range[0].where(is_range, salaries), errors='coerce').astype('float64')
+    max_salary = pd.to_numeric(salary_range[2].where(is_range, salaries), errors='coerce').astype('float64')
+    return min_salary, max_salary
+
+# Clean a job type column into a categorical column, empty job types become missing
+def clean_job_type_column(job_types):
+    return clean_distinct_values(clean_job_type_values, job_types).astype('category')
+
+def clean_job_type_values(job_types):
+    # Remove any numeric characters and the '+' sign
+    return job_types.where(job_types.notna() & (job_types != '')).str.replace(r'\+\d+', '', regex=True)
 
-    while True:
+# Clean a 'Date Posted' column into datetime64, counting back from `now` (today by default)
+def clean_date_posted_column(dates_posted, now=None):
+    import pandas as pd
+    now = pd.Timestamp.now().normalize() if now is None else pd.Timestamp(now)
+    return clean_distinct_values(clean_date_posted_values, dates_posted, now)
+
+def clean_date_posted_values(dates_posted, now):
+    import pandas as pd
+
+    # Remove unwanted phrases and standardize "Today"
+    dates_posted = dates_posted.where(dates_posted != '').str.replace(r'Posted|EmployerActive', '', regex=True).str.strip()
+    dates_posted = dates_posted.str.replace('Today', '0 days ago', regex=False)
+
+    # "30+ days ago" counts as 30 days, otherwise take the first number; no number means NaT
+    days_ago = dates_posted.str.extract(r'(\d+)', expand=False).astype('float64')
+    days_ago = days_ago.mask(dates_posted.str.contains('+', regex=False, na=False), 30)
+    return (now - pd.to_timedelta(days_ago, unit='D')).astype('datetime64[ns]')
+
+
+# Tracking parameters Indeed adds to job URLs that change from one crawl to the next
+VOLATILE_URL_PARAMS = {'xkcb', 'camk', 'p', 'fvj', 'vjs', 'tk', 'from', 'advn', 'sjdu', 'acatk', 'pub'}
+
+# Stable key for a job URL: the job key (`jk`) when the URL has one, otherwise the URL without its
+# volatile tracking parameters
+def job_url_key(job_url):
+    from urllib.parse import parse_qsl, urlencode
+
+    parts = urlparse(job_url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    for name, value in params:
+        if name == 'jk':
+            return 'jk=' + value
+    stable = urlencode([(name, value) for name, value in params if name not in VOLATILE_URL_PARAMS])
+    return parts.path + '?' + stable
+
+
+# Absolute URL of a job card link. Sponsored cards link to a `pagead/clk` redirect without the job key,
+# those are replaced by the canonical `viewjob?jk=` URL of the posting, from the link's `data-jk`.
+def job_card_url(href, jk=None):
+    if jk and not re.search(r'[?&]jk=', href):
+        return BASE_URL + '/viewjob?jk=' + jk
+    return BASE_URL + href
+
+
+# Near-duplicate postings: MinHash signatures over word shingles (pairs of consecutive words) of the title,
+# company and summary, bucketed with LSH (locality-sensitive hashing) so a posting is only compared with
+# the earlier postings sharing one of its bands. A posting is a repost when the estimated Jaccard
+# similarity reaches `threshold` and the titles share at least half their words (snippets are short and
+# often company boilerplate, so the same text under another title is another job). Postings in different
+# locations are never duplicates.
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.6, num_perm=64, bands=16, shingle_size=2, seed=1):
+        import numpy as np
+        rng = np.random.RandomState(seed)
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Multiply-shift hash functions: (a * x + b) mod 2**64, keeping the high 32 bits
+        self.a = rng.randint(0, 2 ** 63, (num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.randint(0, 2 ** 63, (num_perm, 1), dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = {}  # (location, band, band values) -> postings in the bucket
+        self.signatures = []
+        self.titles = []
+        self.stats = {'postings': 0, 'near_duplicates': 0, 'compared': 0}
+
+    # MinHash signature of a text: the smallest shingle hash under each hash function
+    def signature(self, text):
+        import zlib
+        import numpy as np
+
+        words = re.findall(r'\w+', text.lower())
+        shingles = {zlib.crc32(' '.join(words[i:i + self.shingle_size]).encode('utf-8'))
+                    for i in range(max(len(words) - self.shingle_size + 1, 1))}
+        hashes = self.a * np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashes += self.b
+        return (hashes.min(axis=1) >> np.uint64(32)).astype(np.uint32)
+
+    # Whether the posting nearly repeats an earlier one, otherwise it is added to the index
+    def is_near_duplicate(self, title, company, location, summary):
+        signature = self.signature(' '.join((title, company, summary or '')))
+        title_words = frozenset(re.findall(r'\w+', title.lower()))
+        values, width = signature.tobytes(), 4 * self.rows
+        keys = [(location, band, values[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+        candidates = {posting for key in keys for posting in self.buckets.get(key, ())}
+        self.stats['compared'] += len(candidates)
+        for posting in candidates:
+            if ((self.signatures[posting] == signature).mean() >= self.threshold
+                    and 2 * len(title_words & self.titles[posting]) >= len(title_words | self.titles[posting])):
+                self.stats['near_duplicates'] += 1
+                return True
+
+        posting = len(self.signatures)
+        self.signatures.append(signature)
+        self.titles.append(title_words)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(posting)
+        self.stats['postings'] += 1
+        return False
+
+
+# Persistent index of the job URLs written by earlier crawls (keyed by job_url_key), kept in sqlite
+class SeenJobIndex:
+    def __init__(self, path):
+        import sqlite3
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute('CREATE TABLE IF NOT EXISTS seen_jobs (url_key TEXT PRIMARY KEY, first_seen TEXT NOT NULL)')
+
+    def __contains__(self, job_url):
+        return self.db.execute('SELECT 1 FROM seen_jobs WHERE url_key = ?', (job_url_key(job_url),)).fetchone() is not None
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM seen_jobs').fetchone()[0]
+
+    # Record job URLs once their rows are safely written to the output
+    def add(self, job_urls):
+        first_seen = time.strftime('%Y-%m-%d')
+        self.db.executemany('INSERT OR IGNORE INTO seen_jobs VALUES (?, ?)', [(job_url_key(job_url), first_seen) for job_url in job_urls])
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+# Yield (url, records) for each results page of one query, skipping job URLs already collected.
+# `unique_jobs` holds hashes of the collected job URL keys, so it stays small on long crawls. With a
+# `seen_index` (incremental crawl), postings from earlier crawls are skipped too, and the crawl stops at
+# the first page made up entirely of them.
+def iter_job_pages(job_title, job_location, unique_jobs, max_pages=50, max_workers=4, executor=None, resume_after=None,
+                   seen_index=None):
+    import requests
+    urls = plan_page_urls(job_title, job_location, max_pages)
+
+    # Resuming a crawl: continue after the last page already written to the output
+    if resume_after in urls:
+        urls = urls[urls.index(resume_after) + 1:]
+
+    # Pages are fetched concurrently but handed back in page order
+    for url, html in fetch_pages(urls, max_workers=max_workers, executor=executor):
         print(url)
-        try:
-            # Use headers in the request
-            html = scraper.get(url, headers=headers)
-            
-        except requests.RequestException as e:
-            print("Network error occurred: ", e)
+        if isinstance(html, requests.RequestException):
+            print("Network error occurred: ", html)
             break
 
         if not html or html.status_code != 200:
@@ -259,68 +1154,472 @@ def main(job_title, job_location, filepath):
                 print("Try to run again using different network, mobile hotspot with VPN.\n")
             break
 
-        cards, soup = collect_job_cards_from_page(html)
-        if not cards:
+        page_records, next_url = parse_results_page(html)
+        if not page_records:
             print("No job postings found on this page.")
             break
 
-        for card in cards:
-            record = extract_job_card_data(card)
-            if all(record) and record[-1] not in unique_jobs:  # Check if all fields are non-empty
-                job_data.append(record)
-                unique_jobs.add(record[-1])
+        page_records = [record for record in page_records if all(record)]  # Check if all fields are non-empty
+        if seen_index is not None:
+            new_records = [record for record in page_records if record[-1] not in seen_index]
+            if page_records and not new_records:
+                print("Every job posting on this page was collected by an earlier crawl, stopping.")
+                break
+            page_records = new_records
 
-        url = find_next_page(soup)
-        if not url:
+        records = []
+        for record in page_records:
+            key = hash(job_url_key(record[-1]))
+            if key not in unique_jobs:
+                records.append(record)
+                unique_jobs.add(key)
+        dedup_stats['collected'] += len(page_records)
+        dedup_stats['url_duplicates'] += len(page_records) - len(records)
+        yield url, records
+
+        # The last results page has no "Next Page" link, the remaining planned pages are not needed
+        if not next_url:
             break
 
-    if job_data:
-        print('Finished collecting {:,d} job postings. Successfully Collecting! Please wait a few minutes to half an hour for data processing...'.format(len(unique_jobs)))
 
-        # Convert the job data list to a DataFrame
-        df = pd.DataFrame(job_data, columns=["JobTitle", "Company", "Location", "Salary", "JobType", "Summary", "Date Posted", "JobUrl"])
+# Scrape every results page of one query into a list of records
+def scrape_jobs(job_title, job_location, unique_jobs=None, max_pages=50, max_workers=4, executor=None):
+    job_data = []  # List to store job data
+    if unique_jobs is None:
+        unique_jobs = set()  # Track job URLs to avoid collecting duplicate records
+    for _, records in iter_job_pages(job_title, job_location, unique_jobs, max_pages, max_workers, executor):
+        job_data.extend(records)
+    return job_data
+
+
+# Group page records into chunks of at least `chunk_size` records. A chunk always ends on a page
+# boundary, so the (last_url, records) it yields can be checkpointed once the records are written.
+def iter_record_chunks(pages, chunk_size):
+    chunk = []
+    last_url = None
+    for last_url, records in pages:
+        chunk.extend(records)
+        if len(chunk) >= chunk_size:
+            yield last_url, chunk
+            chunk = []
+    if last_url is not None:
+        yield last_url, chunk
+
+
+# Per-run deduplication statistics: postings collected, and postings dropped as repeated job URLs, exact
+# repeats of an earlier posting and near-duplicates, before any of them is preprocessed. Reset when a crawl starts.
+dedup_stats = {'collected': 0, 'url_duplicates': 0, 'exact_duplicates': 0, 'near_duplicates': 0}
+
+# Estimated similarity above which a posting is a near-duplicate of an earlier one, 0 disables the check
+near_duplicate_threshold = 0.6
+
+
+# Drop records that repeat an earlier posting in every column except "Summary" and "JobUrl", and with a
+# `near_duplicates` index, reposts nearly matching an earlier posting (reworded title or summary), across
+# chunks (process_job_data only sees one chunk at a time). The job URLs of the dropped records are
+# added to `dropped`.
+def drop_seen_duplicates(records, seen_keys, near_duplicates=None, dropped=None):
+    unique_records = []
+    with stage_timer.stage('drop_duplicates', len(records)):
+        for record in records:
+            key = hash(record[:5] + record[6:7])
+            if key in seen_keys:
+                dedup_stats['exact_duplicates'] += 1
+            else:
+                seen_keys.add(key)
+                if near_duplicates is None or not near_duplicates.is_near_duplicate(record[0], record[1], record[2], record[5]):
+                    unique_records.append(record)
+                    continue
+                dedup_stats['near_duplicates'] += 1
+            if dropped is not None:
+                dropped.append(record[-1])
+    return unique_records
+
+
+# Columns of the exported dataset, in order
+OUTPUT_COLUMNS = ['JobTitle','Company', 'Location', 'Min Salary', 'Max Salary', 'JobType', 'Summary', 'Date Posted', 'JobUrl']
+
+# Clean and preprocess one frame of deduplicated job records, `now` is the date the crawl counts back from
+def clean_job_frame(df_cleaned, now=None):
+    df_cleaned = df_cleaned.copy()
+    rows = len(df_cleaned)
+
+    # Apply the cleaning function to the JobTitle column
+    with stage_timer.stage('clean_job_title', rows):
+        df_cleaned['JobTitle'] = df_cleaned['JobTitle'].apply(clean_job_title)
+
+    # Data Preprocessing: Clean and preprocess text data
+    with stage_timer.stage('preprocess_summaries', rows):
+        df_cleaned['Summary'] = preprocess_summaries(df_cleaned['Summary'])
+
+    # Clean and split salary data
+    with stage_timer.stage('clean_salary', rows):
+        df_cleaned['Min Salary'], df_cleaned['Max Salary'] = clean_salary_column(df_cleaned['Salary'])
+
+    # Clean Job Type Data
+    with stage_timer.stage('clean_job_type', rows):
+        df_cleaned['JobType'] = clean_job_type_column(df_cleaned['JobType'])
+
+    # Clean Date Posted to get the actual date
+    with stage_timer.stage('clean_date_posted', rows):
+        df_cleaned['Date Posted'] = clean_date_posted_column(df_cleaned['Date Posted'], now)
+
+    # Reorder columns
+    return df_cleaned[OUTPUT_COLUMNS]
+
 
-        # Remove duplicates based on all columns except "Summary" and "JobUrl"
-        df_cleaned = df.drop_duplicates(subset=df.columns.difference(['Summary', 'JobUrl']))
+# Load the heavy models once per preprocessing worker, with the parent's settings
+def init_preprocessing_worker(batch_size, num_beams, cache_path):
+    global t5_batch_size, t5_num_beams, spell_cache_path
+    import torch
 
-        # Apply the cleaning function to the JobTitle column
-        df_cleaned.loc[:, 'JobTitle'] = df_cleaned['JobTitle'].apply(clean_job_title)
+    t5_batch_size, t5_num_beams, spell_cache_path = batch_size, num_beams, cache_path
+    torch.set_num_threads(1)  # One core per worker, the pool provides the parallelism
+    stage_timer.reset()  # Workers hand back only the stages they ran
+    get_t5()
+    get_summary_cleaner()
 
-        # Data Preprocessing: Clean and preprocess text data
-        df_cleaned.loc[:, 'Summary'] = df_cleaned['Summary'].apply(preprocess_summary)
+# Clean one shard in a preprocessing worker, handing its stage timings back to the parent
+def clean_job_shard(df_cleaned, now=None):
+    df_cleaned = clean_job_frame(df_cleaned, now)
+    return df_cleaned, stage_timer.drain()
 
-        # Clean and split salary data
-        min_salary, max_salary = zip(*df_cleaned['Salary'].apply(clean_salary_data))
-        df_cleaned.loc[:, 'Min Salary'] = min_salary
-        df_cleaned.loc[:, 'Max Salary'] = max_salary
 
-        # Clean Job Type Data
-        df_cleaned.loc[:, 'JobType'] = df_cleaned['JobType'].apply(clean_job_type)
+# Process pool for the preprocessing stage, each worker loads the models once for the pool's lifetime.
+# Workers are spawned rather than forked: the fetch threads may hold a lock (rate limiter, stage timer)
+# at the moment of a fork, and a forked child would inherit it held.
+def preprocessing_pool(workers):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=init_preprocessing_worker, initargs=(t5_batch_size, t5_num_beams, spell_cache_path))
 
-        # Clean Date Posted to get the actual date
-        df_cleaned.loc[:, 'Date Posted'] = df_cleaned['Date Posted'].apply(clean_date_posted)
 
-        # Reorder columns
-        df_arranged = df_cleaned[['JobTitle','Company', 'Location', 'Min Salary', 'Max Salary', 'JobType', 'Summary', 'Date Posted', 'JobUrl']]
+# Clean and preprocess the scraped records into the final DataFrame.
+# With `workers` > 1 the frame is sharded across a process pool and reassembled in order. Pass the
+# `pool` of a whole crawl, otherwise a pool is started (and its models loaded) for this call only.
+def process_job_data(job_data, workers=1, now=None, pool=None):
+    import pandas as pd
 
-        # Save the DataFrame to a CSV file
-        df_arranged.to_csv(filepath, index=False)
+    if now is None:
+        now = pd.Timestamp.now().normalize()
 
-        # Print the DataFrame
-        print(df_arranged)
-        print('\nSuccessfully export to CSV!') # Print the number of jobs collected
+    # Convert the job data list to a DataFrame
+    df = pd.DataFrame(job_data, columns=["JobTitle", "Company", "Location", "Salary", "JobType", "Summary", "Date Posted", "JobUrl"])
 
+    # Remove duplicates based on all columns except "Summary" and "JobUrl"
+    df_cleaned = df.drop_duplicates(subset=df.columns.difference(['Summary', 'JobUrl']))
+
+    if workers <= 1 or len(df_cleaned) < 2:
+        return clean_job_frame(df_cleaned, now)
+
+    # A few shards per worker keeps the workers busy when some summaries take longer than others
+    shard_size = -(-len(df_cleaned) // (workers * 4))
+    shards = [df_cleaned.iloc[start:start + shard_size].copy() for start in range(0, len(df_cleaned), shard_size)]
+
+    with contextlib.nullcontext(pool) if pool is not None else preprocessing_pool(workers) as executor:
+        frames = []
+        for frame, stages in executor.map(functools.partial(clean_job_shard, now=now), shards):
+            frames.append(frame)
+            stage_timer.merge(stages)
+        return pd.concat(frames)
+
+
+# Columns repeating a few distinct values, dictionary-encoded in the Parquet output (categories in pandas)
+PARQUET_DICTIONARY_COLUMNS = ['Company', 'Location', 'JobType']
+
+# Typed schema of the Parquet output: dictionary-encoded repeated strings, float salaries, datetime dates
+def parquet_schema():
+    import pyarrow as pa
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('JobTitle', pa.string()),
+        ('Company', dictionary),
+        ('Location', dictionary),
+        ('Min Salary', pa.float64()),
+        ('Max Salary', pa.float64()),
+        ('JobType', dictionary),
+        ('Summary', pa.string()),
+        ('Date Posted', pa.timestamp('ms')),
+        ('JobUrl', pa.string()),
+    ])
+
+
+# Append cleaned chunks to the output as they are produced. A `.parquet` output is a dataset directory
+# of zstd-compressed part files with a typed schema, partitioned by crawl date (`crawl_date=YYYY-MM-DD/`):
+# a new crawl replaces only the partition of its own date. Anything else is a single CSV file.
+class JobWriter:
+    def __init__(self, filepath, append=False, crawl_date=None):
+        self.filepath = filepath
+        self.parquet = filepath.endswith('.parquet')
+        self.rows = 0
+
+        if self.parquet:
+            import glob
+            self.partition = os.path.join(filepath, 'crawl_date={}'.format(crawl_date or time.strftime('%Y-%m-%d')))
+            os.makedirs(filepath, exist_ok=True)
+            if not append:
+                # Only this crawl date is replaced, the partitions of earlier crawls are the dataset's history
+                for part in glob.glob(os.path.join(self.partition, 'part-*.parquet')):
+                    os.remove(part)
+            # Appending continues the whole dataset, including the URLs collected by earlier crawls
+            self.has_parts = append and bool(glob.glob(os.path.join(filepath, '**', 'part-*.parquet'), recursive=True))
+            self.part = len(glob.glob(os.path.join(self.partition, 'part-*.parquet')))
+        else:
+            self.append = append and os.path.exists(filepath)
+
+    # Job URLs already in the output, used to skip them when a crawl resumes
+    def read_job_urls(self):
+        import pandas as pd
+        if self.parquet:
+            if self.has_parts:
+                yield from pd.read_parquet(self.filepath, columns=['JobUrl'])['JobUrl']
+        elif self.append:
+            for chunk in pd.read_csv(self.filepath, usecols=['JobUrl'], chunksize=100000):
+                yield from chunk['JobUrl']
+
+    def write(self, df):
+        if df.empty:
+            return
+
+        with stage_timer.stage('write', len(df)):
+            self.write_part(df)
+        self.rows += len(df)
+
+    def write_part(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # One schema for every part, even when a chunk has no salaries or dates at all
+            table = pa.Table.from_pandas(df[OUTPUT_COLUMNS], schema=parquet_schema(), preserve_index=False)
+            os.makedirs(self.partition, exist_ok=True)
+            pq.write_table(table, os.path.join(self.partition, 'part-{:05d}.parquet'.format(self.part)), compression='zstd',
+                           use_dictionary=PARQUET_DICTIONARY_COLUMNS + ['JobTitle'])
+            self.part += 1
+            self.has_parts = True
+        else:
+            df.to_csv(self.filepath, mode='a' if self.append else 'w', header=not self.append, index=False)
+            self.append = True
+
+
+# Crawl checkpoint: the last results page written to the output, for each query
+def load_checkpoint(path):
+    import json
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    import json
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(path + '.tmp', path)  # Never leave a half-written checkpoint behind
+
+
+# Stream one query to disk: pages -> cards -> records -> cleaning -> writer, checkpointing every chunk
+def stream_query(job_title, job_location, writer, checkpoint, checkpoint_path, unique_jobs, seen_keys,
+                 max_pages=50, max_workers=4, executor=None, preprocess_workers=1, chunk_size=100, seen_index=None,
+                 now=None, near_duplicates=None, preprocess_pool=None):
+    query = '{}|{}'.format(job_title, job_location)
+    pages = iter_job_pages(job_title, job_location, unique_jobs, max_pages, max_workers, executor,
+                           resume_after=checkpoint.get(query), seen_index=seen_index)
+    written = 0
+    preprocess_time = 0.0
+
+    for last_url, records in iter_record_chunks(pages, chunk_size):
+        dropped = []
+        records = drop_seen_duplicates(records, seen_keys, near_duplicates, dropped)
+        if records:
+            start = time.perf_counter()
+            with stage_timer.stage('process_job_data', len(records)):
+                df_arranged = process_job_data(records, preprocess_workers, now, preprocess_pool)
+            preprocess_time += time.perf_counter() - start
+            writer.write(df_arranged)
+            written += len(df_arranged)
+            print('Saved {:,d} job postings for `{}` in `{}`'.format(written, job_title, job_location))
+        if seen_index is not None:
+            # Duplicates too: once their original is known, a later crawl must not take them for new postings
+            seen_index.add([record[-1] for record in records] + dropped)
+
+        checkpoint[query] = last_url
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    return written, preprocess_time
+
+
+# Crawl (job_title, job_location) queries in one process, sharing the fetch pool and the loaded models,
+# and stream them into a single output deduplicated on JobUrl. With `resume`, the output is appended to
+# and each query continues after the last page recorded in the checkpoint file. With `seen_index_path`
+# (incremental crawl), only postings missing from the persistent index are preprocessed and appended.
+def run_crawl(queries, filepath, max_pages=50, max_workers=4, preprocess_workers=1, chunk_size=100, resume=False,
+              seen_index_path=None):
+    checkpoint_path = filepath + '.checkpoint.json'
+    checkpoint = load_checkpoint(checkpoint_path) if resume else {}
+    seen_index = SeenJobIndex(seen_index_path) if seen_index_path else None
+    now = time.strftime('%Y-%m-%d')  # Every posting date counts back from the day the crawl started
+    writer = JobWriter(filepath, append=resume or seen_index is not None, crawl_date=now)
+
+    unique_jobs = {hash(job_url_key(job_url)) for job_url in writer.read_job_urls()}  # Shared by every query
+    seen_keys = set()
+    reset_fetch_stats()
+    dedup_stats.update(dict.fromkeys(dedup_stats, 0))
+    # Within this run only: the summaries already in the output are preprocessed, they would not match raw ones
+    near_duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
+    crawl_start = time.perf_counter()
+
+    # One preprocessing pool for the whole crawl, the workers keep their models and caches across chunks
+    preprocess_pool = preprocessing_pool(preprocess_workers) if preprocess_workers > 1 else None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, preprocess_pool or contextlib.nullcontext():
+        for number, (job_title, job_location) in enumerate(queries, 1):
+            print("[{}/{}] Starting to scrape Indeed for `{}` in `{}`".format(number, len(queries), job_title, job_location))
+            start = time.perf_counter()
+            written, preprocess_time = stream_query(job_title, job_location, writer, checkpoint, checkpoint_path,
+                                                    unique_jobs, seen_keys, max_pages, max_workers, executor,
+                                                    preprocess_workers, chunk_size, seen_index, now, near_duplicates,
+                                                    preprocess_pool)
+            elapsed = time.perf_counter() - start
+
+            print("[{}/{}] `{}` in `{}`: {:,d} new job postings (scrape {:.1f}s, preprocess {:.1f}s)".format(
+                number, len(queries), job_title, job_location, written, elapsed - preprocess_time, preprocess_time))
+
+    if seen_index is not None:
+        print('Seen job index now holds {:,d} job postings'.format(len(seen_index)))
+        seen_index.close()
+
+    if dedup_stats['collected']:
+        dropped = dedup_stats['url_duplicates'] + dedup_stats['exact_duplicates'] + dedup_stats['near_duplicates']
+        print('Deduplication: {:,d} of {:,d} postings dropped before preprocessing ({:.1%}): {url_duplicates:,d} repeated URLs, '
+              '{exact_duplicates:,d} exact repeats, {near_duplicates:,d} near-duplicates'.format(
+                  dropped, dedup_stats['collected'], dropped / dedup_stats['collected'], **dedup_stats))
+
+    with fetch_stats_lock:
+        if fetch_stats['requests']:
+            elapsed = time.perf_counter() - crawl_start
+            print('Fetch: {pages:,d} pages in {requests:,d} requests, {failed:,d} failed, {retries:,d} retries ({throttled:,d} throttled, '
+                  '{server_errors:,d} server errors, {network_errors:,d} network errors), gave up on {gave_up:,d}, '
+                  'backed off {backoff_seconds:.1f}s'.format(**fetch_stats))
+            print('Effective throughput {:.2f} pages/s, request rate now {}'.format(
+                fetch_stats['pages'] / elapsed if elapsed else 0.0,
+                ', '.join('{} {:.2f}/s'.format(host, limiter.rate) for host, limiter in rate_limiters.items())))
+
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        with response_cache.lock:
+            response_cache.flush()
+        print('HTTP response cache: {}'.format(response_cache.stats))
+
+    if writer.rows:
+        print('\nSuccessfully export {:,d} job postings to {} in {:.1f}s!'.format(
+            writer.rows, filepath, time.perf_counter() - crawl_start))
     else:
-        # print('\nFinished collecting {:,d}'.format(len(unique_jobs))) # Print the number of jobs collected
-        print('Please try again...') # Print the number of jobs collected
+        print('Please try again...')
 
-    return job_data
+    return writer.rows
+
+
+def main(job_title, job_location, filepath, max_pages=50, max_workers=4, preprocess_workers=1, chunk_size=100, resume=False,
+         seen_index_path=None):
+    return run_crawl([(job_title, job_location)], filepath, max_pages, max_workers, preprocess_workers, chunk_size, resume,
+                     seen_index_path)
+
+
+# Read a query manifest into (job_title, job_location) pairs.
+# CSV manifests need `job_title` and `job_location` columns, YAML manifests a list of mappings
+# with the same keys (optionally under a top-level `queries` key).
+def load_query_manifest(path):
+    import pandas as pd
+    if path.endswith(('.yaml', '.yml')):
+        import yaml  # Only needed for YAML manifests
+        with open(path) as f:
+            entries = yaml.safe_load(f) or []
+        if isinstance(entries, dict):
+            entries = entries.get('queries', [])
+    else:
+        entries = pd.read_csv(path, dtype=str, keep_default_na=False).to_dict('records')
+
+    # Missing fields are empty, not "nan" or "None". Blank rows are skipped, and a repeated query (which
+    # would share the checkpoint of the first one) is only crawled once
+    queries = []
+    for entry in entries:
+        query = tuple('' if entry.get(field) is None else str(entry[field]).strip() for field in ('job_title', 'job_location'))
+        if any(query) and query not in queries:
+            queries.append(query)
+    return queries
+
+
+# Crawl every query of a manifest file in one run
+def crawl_queries(manifest_path, filepath, max_pages=50, max_workers=4, preprocess_workers=1, chunk_size=100, resume=False,
+                  seen_index_path=None):
+    return run_crawl(load_query_manifest(manifest_path), filepath, max_pages, max_workers, preprocess_workers, chunk_size, resume,
+                     seen_index_path)
 
 
 # Run the main function
 if __name__ == '__main__':
-    title = 'IT'
-    loc = 'Malaysia'
-    path = 'indeed_job.csv'
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scrape Indeed job postings')
+    parser.add_argument('--manifest', help='CSV/YAML file of job_title,job_location queries to crawl in one run')
+    parser.add_argument('--output', default='indeed_job.csv', help='Output CSV path, or a .parquet dataset directory partitioned by crawl date')
+    parser.add_argument('--max-pages', type=int, default=50, help='Maximum results pages per query')
+    parser.add_argument('--workers', type=int, default=4, help='Number of concurrent page fetches')
+    parser.add_argument('--prefetch-pages', type=int, default=max_prefetch_pages,
+                        help='Results pages requested ahead of the current one (each is wasted past the last page)')
+    parser.add_argument('--preprocess-workers', type=int, default=1, help='Number of processes for the preprocessing stage')
+    parser.add_argument('--parser', choices=['html.parser', 'lxml', 'selectolax'], default=parser_backend, help='HTML parser backend for results pages')
+    parser.add_argument('--chunk-size', type=int, default=100, help='Job postings cleaned and written per chunk')
+    parser.add_argument('--resume', action='store_true', help='Append to the output and continue from the last checkpoint')
+    parser.add_argument('--seen-index', help='sqlite index of collected job URLs, only new postings are processed and appended')
+    parser.add_argument('--t5-batch-size', type=int, default=t5_batch_size, help='Summaries per T5 normalization batch')
+    parser.add_argument('--greedy', action='store_true', help='Use greedy decoding instead of beam search for T5')
+    parser.add_argument('--spell-cache', default=spell_cache_path, help='sqlite file persisting spell corrections across crawls')
+    parser.add_argument('--near-duplicate-threshold', type=float, default=near_duplicate_threshold,
+                        help='Similarity (0-1) above which a reposted ad is dropped before preprocessing, 0 to disable')
+    parser.add_argument('--max-retries', type=int, default=max_retries, help='Retries of a throttled or failed page request')
+    parser.add_argument('--rate', type=float, default=requests_per_second, help='Initial requests per second per host, adapts to throttling')
+    parser.add_argument('--http-cache', default=response_cache_path, help='sqlite file caching results pages between runs')
+    parser.add_argument('--cache-ttl', type=float, default=response_cache_ttl, help='Seconds a cached page is used without revalidation')
+    parser.add_argument('--cache-max-mb', type=float, default=response_cache_max_bytes / 2 ** 20, help='Size bound of the HTTP cache')
+    parser.add_argument('--replay', action='store_true', help='Serve every page from the HTTP cache, never touch the network')
+    parser.add_argument('--run-report', help='Write per-stage wall/CPU time, counts and throughput to this JSON file')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'], help='Also dump a profile of the whole run')
+    args = parser.parse_args()
+
+    parser_backend = args.parser
+    spell_cache_path = args.spell_cache
+    t5_batch_size = args.t5_batch_size
+    max_retries = args.max_retries
+    max_prefetch_pages = args.prefetch_pages
+    near_duplicate_threshold = args.near_duplicate_threshold
+    requests_per_second = args.rate
+    response_cache_path = args.http_cache
+    response_cache_ttl = args.cache_ttl
+    response_cache_max_bytes = int(args.cache_max_mb * 2 ** 20)
+    response_cache_replay = args.replay
+    if args.replay and not response_cache_path:
+        parser.error('--replay needs --http-cache (or INDEED_HTTP_CACHE)')
+    if args.greedy:
+        t5_num_beams = 1
+
+    from code_profiling import print_report, profile_path, profiled
+
+    profile = args.profile and profile_path(args.run_report or args.output, args.profile)
+    with profiled(profile, args.profile) if profile else contextlib.nullcontext():
+        if args.manifest:
+            rows = crawl_queries(args.manifest, args.output, args.max_pages, args.workers, args.preprocess_workers,
+                                 args.chunk_size, args.resume, args.seen_index)
+        else:
+            title = 'IT'
+            loc = 'Malaysia'
+            rows = main(title, loc, args.output, args.max_pages, args.workers, args.preprocess_workers,
+                        args.chunk_size, args.resume, args.seen_index)
 
-    df = main(title, loc, path)
\ No newline at end of file
+    if args.run_report:
+        print_report(stage_timer.write_report(args.run_report, rows=rows, output=args.output, parser=parser_backend,
+                                              t5_batch_size=t5_batch_size, t5_num_beams=t5_num_beams, fetch=fetch_stats,
+                                              dedup=dedup_stats))
+        print('Run report written to {}'.format(args.run_report))
+    if profile:
+        print('Profile written to {}'.format(profile))